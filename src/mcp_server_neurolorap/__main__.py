@@ -87,6 +87,47 @@ def get_config_path() -> Path:
     )
 
 
+def _build_or_update_config(
+    existing: ClinesConfig,
+) -> tuple[ClinesConfig, bool]:
+    """Add or refresh this server's entry in a Cline configuration.
+
+    Args:
+        existing: Parsed Cline configuration, updated in place
+
+    Returns:
+        tuple[ClinesConfig, bool]: The configuration and whether it changed
+    """
+    # Get project root path
+    project_root = Path(__file__).resolve().parent.parent.parent
+
+    server_name = "aindreyway-mcp-neurolorap"
+    server_config: ServerConfig = {
+        "command": sys.executable,
+        "args": ["-m", "mcp_server_neurolorap"],
+        "disabled": False,
+        "alwaysAllow": [],
+        "env": {
+            "PYTHONPATH": str(project_root),
+            "PYTHONUNBUFFERED": "1",
+            "MCP_PROJECT_ROOT": str(project_root),
+        },
+    }
+
+    if server_name not in existing["mcpServers"]:
+        existing["mcpServers"][server_name] = server_config
+        logger.info("Added server configuration to Cline")
+        return existing, True
+
+    if existing["mcpServers"][server_name] != server_config:
+        existing["mcpServers"][server_name] = server_config
+        logger.info("Updated server configuration in Cline")
+        return existing, True
+
+    logger.info("Server already configured in Cline")
+    return existing, False
+
+
 def configure_cline(config_path: Path | None = None) -> None:
     """Configure integration with Cline.
 
@@ -113,36 +154,10 @@ def configure_cline(config_path: Path | None = None) -> None:
             config_path.parent.mkdir(parents=True, exist_ok=True)
             config = {"mcpServers": {}}
 
-        # Get project root path
-        project_root = Path(__file__).resolve().parent.parent.parent
-
-        server_name = "aindreyway-mcp-neurolorap"
-        server_config: ServerConfig = {
-            "command": sys.executable,
-            "args": ["-m", "mcp_server_neurolorap"],
-            "disabled": False,
-            "alwaysAllow": [],
-            "env": {
-                "PYTHONPATH": str(project_root),
-                "PYTHONUNBUFFERED": "1",
-                "MCP_PROJECT_ROOT": str(project_root),
-            },
-        }
-
-        if server_name not in config["mcpServers"]:
-            config["mcpServers"][server_name] = server_config
+        config, changed = _build_or_update_config(config)
+        if changed:
             with open(config_path, "w", encoding="utf-8") as f:
                 json.dump(config, f, indent=2)
-            logger.info("Added server configuration to Cline")
-        else:
-            current_config = config["mcpServers"][server_name]
-            if current_config != server_config:
-                config["mcpServers"][server_name] = server_config
-                with open(config_path, "w", encoding="utf-8") as f:
-                    json.dump(config, f, indent=2)
-                logger.info("Updated server configuration in Cline")
-            else:
-                logger.info("Server already configured in Cline")
 
     except Exception as e:
         logger.warning(f"Failed to configure Cline: {e}")
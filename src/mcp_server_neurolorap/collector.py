@@ -6,10 +6,13 @@ contents of all relevant files.
 """
 
 import fnmatch
+import functools
 import logging
 import os
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import Deque, Dict, List, Optional, Sequence, Tuple, Union
 
 from .storage import StorageManager
 
@@ -94,6 +97,8 @@ class CodeCollector:
         """
         # Get the project root directory
         self.project_root = project_root or Path.cwd()
+        # Prefix used for cheap "is inside project root" string checks
+        self._root_prefix = str(self.project_root).rstrip(os.sep) + os.sep
         logger.debug("Project root: %s", self.project_root)
         logger.debug("Current working directory: %s", Path.cwd())
 
@@ -153,21 +158,24 @@ class CodeCollector:
         Returns:
             bool: True if file should be ignored, False otherwise.
         """
-        # Get relative path from project root
-        try:
-            relative_path = file_path.relative_to(self.project_root)
-            logger.debug(f"Checking relative path: {relative_path}")
-        except ValueError:
-            relative_path = file_path
-            logger.debug(f"Using absolute path: {relative_path}")
-
-        str_path = str(relative_path)
+        # Get relative path from project root with a prefix comparison,
+        # avoiding the exception raised by relative_to() for outside paths
+        full_path = str(file_path)
+        parts: Sequence[str]
+        if full_path.startswith(self._root_prefix):
+            str_path = full_path[len(self._root_prefix) :]
+            parts = str_path.split(os.sep)
+            logger.debug(f"Checking relative path: {str_path}")
+        else:
+            str_path = full_path
+            parts = file_path.parts
+            logger.debug(f"Using absolute path: {str_path}")
 
         # Check each ignore pattern
         for pattern in self.ignore_patterns:
             # Handle directory patterns (ending with /)
             if pattern.endswith("/"):
-                if any(part == pattern[:-1] for part in relative_path.parts):
+                if any(part == pattern[:-1] for part in parts):
                     logger.debug(
                         f"Ignoring {str_path} (matches dir pattern {pattern})"
                     )
@@ -182,7 +190,7 @@ class CodeCollector:
                 return True
 
         # Additional checks
-        if "FULL_CODE_" in str(file_path):
+        if "FULL_CODE_" in full_path:
             logger.debug(f"Ignoring {str_path} (generated file)")
             return True
 
@@ -204,9 +212,32 @@ class CodeCollector:
         logger.debug(f"Including {str_path}")
         return False
 
-    def make_anchor(self, path: Path) -> str:
+    def _sync_directory(self, directory: Path) -> None:
+        """Flush directory metadata so newly written files are visible.
+
+        Args:
+            directory: Directory containing the written files.
+        """
+        try:
+            fd = os.open(directory, os.O_RDONLY)
+        except OSError as e:
+            logger.debug(f"Could not open {directory} for sync: {str(e)}")
+            return
+        try:
+            os.fsync(fd)
+        except OSError as e:
+            # Some platforms and filesystems do not support directory fsync
+            logger.debug(f"Could not sync {directory}: {str(e)}")
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def make_anchor(path: Path) -> str:
         """Create a valid markdown anchor from a path.
 
+        The result depends only on the path, so it is memoized.
+
         Args:
             path: Path to convert to anchor.
 
@@ -237,12 +268,10 @@ class CodeCollector:
                 # Convert relative path to absolute using project_root
                 path = Path(input_path)
                 if not path.is_absolute():
-                    path = (self.project_root / path).resolve()
-                else:
-                    path = path.resolve()
+                    path = self.project_root / path
+                path = path.resolve()
 
                 logger.debug(f"Processing path: {path}")
-                logger.debug(f"Path absolute: {path.absolute()}")
                 logger.debug(f"Path exists: {path.exists()}")
                 logger.debug(f"Path is file: {path.is_file()}")
                 logger.debug(f"Path is dir: {path.is_dir()}")
@@ -271,38 +300,88 @@ class CodeCollector:
                 if not self.should_ignore_file(path):
                     all_files.append(path)
             else:
-                for root, dirs, files in os.walk(path):
-                    root_path = Path(root)
-                    logger.debug(f"Walking directory: {root_path}")
-                    # Remove ignored directories in-place
-                    dirs[:] = [
-                        d
-                        for d in dirs
-                        if not self.should_ignore_file(root_path / d)
-                    ]
-                    logger.debug(f"Filtered directories: {dirs}")
-
-                    for file in sorted(files):
-                        file_path = root_path / file
-                        if not self.should_ignore_file(file_path):
-                            all_files.append(file_path)
-
-        # Sort files with PROJECT_SUMMARY.md first
-        def sort_key(path: Path) -> tuple[int, str]:
-            try:
-                relative_path = path.relative_to(self.project_root)
-            except ValueError:
-                relative_path = path
+                all_files.extend(self._walk_files(path))
+
+        # Sort files with PROJECT_SUMMARY.md first. Keys are built from a
+        # plain string slice rather than a relative_to() call that raises
+        # for paths outside the root.
+        root_prefix = self._root_prefix
+
+        def sort_key(path: Path) -> tuple[bool, str]:
+            str_path = str(path)
+            if str_path.startswith(root_prefix):
+                str_path = str_path[len(root_prefix) :]
             # Sort order: PROJECT_SUMMARY.md first,
             # then alphabetically
-            is_summary = relative_path.name == "PROJECT_SUMMARY.md"
-            return (0 if is_summary else 1, str(relative_path))
+            return (path.name != "PROJECT_SUMMARY.md", str_path)
 
         sorted_files = sorted(all_files, key=sort_key)
         logger.info(f"Found {len(sorted_files)} files to process")
         logger.debug(f"Files to process: {sorted_files}")
         return sorted_files
 
+    def _scan_directory(
+        self, directory: Path
+    ) -> Tuple[List[Path], List[Path]]:
+        """List the entries of a single directory.
+
+        Unreadable directories are skipped, matching os.walk's default.
+        Symlinked directories are neither descended into nor collected.
+
+        Args:
+            directory: Directory to list.
+
+        Returns:
+            Tuple[List[Path], List[Path]]: Subdirectories and files.
+        """
+        subdirs: List[Path] = []
+        files: List[Path] = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if not is_dir:
+                        files.append(directory / entry.name)
+                    elif not entry.is_symlink():
+                        subdirs.append(directory / entry.name)
+        except OSError as e:
+            logger.debug(f"Skipping unreadable directory {directory}: {e}")
+        return subdirs, files
+
+    def _walk_files(self, root: Path) -> List[Path]:
+        """Collect non-ignored files below a directory.
+
+        Directories are processed from a work queue while a small thread
+        pool lists the queued ones ahead of time, so readdir latency of
+        sibling directories overlaps instead of adding up.
+
+        Args:
+            root: Directory to walk.
+
+        Returns:
+            List[Path]: Files that are not ignored, in no particular order.
+        """
+        found: List[Path] = []
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            pending: Deque[Future[Tuple[List[Path], List[Path]]]] = deque(
+                [executor.submit(self._scan_directory, root)]
+            )
+            while pending:
+                subdirs, files = pending.popleft().result()
+                for subdir in subdirs:
+                    # Skip ignored directories entirely
+                    if not self.should_ignore_file(subdir):
+                        pending.append(
+                            executor.submit(self._scan_directory, subdir)
+                        )
+                for file_path in files:
+                    if not self.should_ignore_file(file_path):
+                        found.append(file_path)
+        return found
+
     def read_file_content(self, file_path: Path) -> str:
         """Read content of a file with proper encoding handling.
 
@@ -376,57 +455,43 @@ class CodeCollector:
             # Create parent directory if it doesn't exist
             code_output_path.parent.mkdir(parents=True, exist_ok=True)
 
+            # Build the whole document in memory and emit it with a
+            # single write instead of one write per section
+            parts: List[str] = [
+                f"# {title}\n\n",
+                "This file contains code from the specified paths, "
+                "organized by file path.\n\n",
+                "## Table of Contents\n\n",
+            ]
+
+            relative_paths: List[Path] = []
+            for file_path in all_files:
+                try:
+                    relative_path = file_path.relative_to(self.project_root)
+                except ValueError:
+                    relative_path = file_path
+                relative_paths.append(relative_path)
+                anchor = self.make_anchor(relative_path)
+                parts.append(f"- [{relative_path}](#{anchor})\n")
+
+            parts.append("\n## Files\n\n")
+            for file_path, relative_path in zip(all_files, relative_paths):
+                content = self.read_file_content(file_path)
+                anchor = self.make_anchor(relative_path)
+                lang = LanguageMap.get_language(file_path)
+
+                parts.append(f"### {relative_path} {{{anchor}}}\n")
+                parts.append(f"```{lang}\n{content}\n```\n\n")
+                logger.debug(f"Processed: {relative_path}")
+
+            code_content = "".join(parts)
+
             # Write code collection file
             with open(code_output_path, "w", encoding="utf-8") as output_file:
-                # Write header
-                output_file.write(f"# {title}\n\n")
-                output_file.write(
-                    "This file contains code from the specified paths, "
-                    "organized by file path.\n\n"
-                )
-
-                # Write table of contents
-                output_file.write("## Table of Contents\n\n")
-                for file_path in all_files:
-                    try:
-                        relative_path = file_path.relative_to(
-                            self.project_root
-                        )
-                    except ValueError:
-                        relative_path = file_path
-                    anchor = self.make_anchor(relative_path)
-                    output_file.write(f"- [{relative_path}](#{anchor})\n")
-
-                # Write file contents
-                output_file.write("\n## Files\n\n")
-                for file_path in all_files:
-                    try:
-                        relative_path = file_path.relative_to(
-                            self.project_root
-                        )
-                    except ValueError:
-                        relative_path = file_path
-
-                    content = self.read_file_content(file_path)
-                    anchor = self.make_anchor(relative_path)
-                    lang = LanguageMap.get_language(file_path)
-
-                    output_file.write(f"### {relative_path} {{{anchor}}}\n")
-                    output_file.write(f"```{lang}\n{content}\n```\n\n")
-                    logger.debug(f"Processed: {relative_path}")
-
-                # Force flush and sync
+                output_file.write(code_content)
                 output_file.flush()
                 os.fsync(output_file.fileno())
 
-            # Force sync to ensure file is visible
-            os.sync()
-
-            # Wait a bit for filesystem to update
-            import time
-
-            time.sleep(0.1)
-
             # Create analysis prompt file with timestamp
             analyze_output_path = self.storage.get_output_path(
                 f"PROMPT_ANALYZE_{timestamp}_{path_str}_{title}.md"
@@ -435,26 +500,19 @@ class CodeCollector:
                 Path(__file__).parent / "prompts" / "analyze.prompt.md"
             )
 
-            # Read code content first
-            code_content = self.read_file_content(code_output_path)
+            # Reuse the in-memory code content instead of re-reading it
             prompt_content = self.read_file_content(prompt_path)
 
             # Write analysis file
             with open(
                 analyze_output_path, "w", encoding="utf-8"
             ) as analyze_file:
-                analyze_file.write(prompt_content)
-                analyze_file.write("\n")
-                analyze_file.write(code_content)
-                # Force flush and sync
+                analyze_file.write(f"{prompt_content}\n{code_content}")
                 analyze_file.flush()
                 os.fsync(analyze_file.fileno())
 
-            # Force sync to ensure file is visible
-            os.sync()
-
-            # Wait a bit for filesystem to update
-            time.sleep(0.1)
+            # File data is synced above; one sync covers both new entries
+            self._sync_directory(code_output_path.parent)
 
             # Touch files and all parent directories
             # to trigger VSCode file watcher
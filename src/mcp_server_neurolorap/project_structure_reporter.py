@@ -8,10 +8,66 @@ This module provides functionality to analyze project structure, including:
 """
 
 import fnmatch
+import functools
 import os
+import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, List, Optional, TypedDict
+from typing import (
+    FrozenSet,
+    Iterator,
+    List,
+    Optional,
+    Pattern,
+    Tuple,
+    TypedDict,
+)
+
+# Start of a line that holds at least one non-whitespace character; line
+# breaks follow universal newlines (\n, \r\n, \r) like text-mode reads
+_NON_EMPTY_LINE_RE = re.compile(r"(?:\A|(?<=[\r\n]))[^\S\r\n]*\S")
+
+# os.path.normcase only folds case where the filesystem does (Windows);
+# elsewhere it is the identity and matching skips it
+_FOLD_CASE = os.path.normcase("A") != "A"
+
+# Characters that make an ignore pattern a glob rather than a literal name
+_GLOB_CHARS = frozenset("*?[")
+
+
+@functools.lru_cache(maxsize=65536)
+def _normcase(name: str) -> str:
+    """Cache os.path.normcase for names repeated across a tree."""
+    return os.path.normcase(name)
+
+
+def _count_non_empty_lines(filepath: Path) -> int:
+    """Count non-empty lines in a text file, or 0 for binary files."""
+    try:
+        with open(filepath, "rb") as f:
+            # Binary file detection reads a bounded head only
+            head = f.read(8192)
+            if b"\0" in head:
+                return 0
+            data = head + f.read()
+
+        # If not binary, count lines in C instead of per-line Python
+        text = data.decode("utf-8")
+        return len(_NON_EMPTY_LINE_RE.findall(text))
+    except (UnicodeDecodeError, OSError):
+        return 0
+
+
+@functools.lru_cache(maxsize=4096)
+def _cached_line_count(path: str, mtime_ns: int, size_bytes: int) -> int:
+    """Count non-empty lines of one version of a file.
+
+    Keyed by (path, mtime_ns, size), so reporters created for repeated
+    tool calls skip re-reading files that have not changed.
+    """
+    return _count_non_empty_lines(Path(path))
 
 
 class FileData(TypedDict):
@@ -38,6 +94,41 @@ class ReportData(TypedDict):
     error_files: int
 
 
+@functools.lru_cache(maxsize=32)
+def _compile_ignore_patterns(
+    patterns: Tuple[str, ...],
+) -> Tuple[FrozenSet[str], FrozenSet[str], Optional[Pattern[str]]]:
+    """Split ignore patterns by how cheaply they can be matched.
+
+    Cached per pattern tuple, so reporters created for repeated tool
+    calls with the same .neuroloraignore reuse the compiled regex.
+
+    Args:
+        patterns: Ignore patterns in glob format
+
+    Returns:
+        Tuple[FrozenSet[str], FrozenSet[str], Optional[Pattern[str]]]:
+        Directory names from patterns ending with "/", literal file
+        patterns for set lookups, and a union regex of the remaining
+        globs (None if there are none)
+    """
+    dir_names = frozenset(p[:-1] for p in patterns if p.endswith("/"))
+    file_patterns = [
+        os.path.normcase(p) for p in patterns if not p.endswith("/")
+    ]
+    literals = frozenset(p for p in file_patterns if _GLOB_CHARS.isdisjoint(p))
+    file_globs = [
+        fnmatch.translate(p) for p in file_patterns if p not in literals
+    ]
+    if not file_globs:
+        return dir_names, literals, None
+    return (
+        dir_names,
+        literals,
+        re.compile("|".join(f"(?:{g})" for g in file_globs)),
+    )
+
+
 class ProjectStructureReporter:
     """Analyzes project structure and generates reports on file metrics."""
 
@@ -53,12 +144,18 @@ class ProjectStructureReporter:
         self.root_dir = root_dir
         self.large_file_threshold = 1024 * 1024  # 1MB
         self.large_lines_threshold = 300
+        self.max_workers = 8  # Files analyzed concurrently
 
         # Load ignore patterns from .neuroloraignore and combine with provided
         # patterns
         self.ignore_patterns = self.load_ignore_patterns()
         if ignore_patterns:
             self.ignore_patterns.extend(ignore_patterns)
+        (
+            self._ignore_dirs,
+            self._ignore_literals,
+            self._ignore_re,
+        ) = _compile_ignore_patterns(tuple(self.ignore_patterns))
 
     def load_ignore_patterns(self) -> List[str]:
         """Load ignore patterns from .neuroloraignore file.
@@ -97,43 +194,109 @@ class ProjectStructureReporter:
         Returns:
             bool: True if path should be ignored
         """
-        try:
-            relative_path = path.relative_to(self.root_dir)
-            str_path = str(relative_path)
-
-            # Check each ignore pattern
-            for pattern in self.ignore_patterns:
-                # Handle directory patterns (ending with /)
-                if pattern.endswith("/"):
-                    if any(
-                        part == pattern[:-1] for part in relative_path.parts
-                    ):
-                        return True
-                # Handle file patterns
-                elif fnmatch.fnmatch(str_path, pattern) or fnmatch.fnmatch(
-                    path.name, pattern
-                ):
-                    return True
+        if self._matches_ignore_rules(path):
+            return True
 
-            # Additional checks
-            if "FULL_CODE_" in str(path):
+        try:
+            if (
+                path.exists() and path.stat().st_size > 1024 * 1024
+            ):  # Skip files > 1MB
                 return True
+        except (FileNotFoundError, PermissionError):
+            return True
 
-            # Always ignore .neuroloraignore files
-            if path.name == ".neuroloraignore":
-                return True
+        return False
 
-            try:
-                if (
-                    path.exists() and path.stat().st_size > 1024 * 1024
-                ):  # Skip files > 1MB
-                    return True
-            except (FileNotFoundError, PermissionError):
-                return True
+    def _matches_ignore_rules(self, path: Path) -> bool:
+        """Check the name-based ignore rules without touching the disk.
+
+        Args:
+            path: Path to check
 
-            return False
+        Returns:
+            bool: True if path matches a pattern or is a generated file
+        """
+        try:
+            relative_path = path.relative_to(self.root_dir)
         except ValueError:
             return True
+        str_path = str(relative_path)
+
+        # Handle directory patterns (ending with /)
+        if not self._ignore_dirs.isdisjoint(relative_path.parts):
+            return True
+        # Handle file patterns: literals by set lookup, globs by one regex
+        name = path.name
+        if _FOLD_CASE:
+            str_path, name = _normcase(str_path), _normcase(name)
+        if str_path in self._ignore_literals or name in self._ignore_literals:
+            return True
+        if self._ignore_re is not None and (
+            self._ignore_re.match(str_path) or self._ignore_re.match(name)
+        ):
+            return True
+
+        # Additional checks
+        if "FULL_CODE_" in str(path):
+            return True
+
+        # Always ignore .neuroloraignore files
+        return path.name == ".neuroloraignore"
+
+    def _walk_files(
+        self, directory: Path
+    ) -> Iterator[Tuple[Path, Optional[os.stat_result]]]:
+        """Yield files that are not ignored, with their stat results.
+
+        Mirrors os.walk(): files of a directory come before its
+        subdirectories, unreadable directories are skipped and symlinked
+        directories are not followed. The stat result cached on each
+        DirEntry is reused by the size check and by analyze_file.
+
+        Args:
+            directory: Directory to walk
+
+        Yields:
+            Tuple[Path, Optional[os.stat_result]]: File path and its stat
+            result, or None if it could not be read
+        """
+        try:
+            with os.scandir(directory) as entries:
+                entry_list = list(entries)
+        except OSError:
+            return
+
+        subdirs: List[Path] = []
+        for entry in entry_list:
+            path = directory / entry.name
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if is_dir:
+                # Prune ignored directories by name alone, before anything
+                # below them is listed or stat'ed
+                if not entry.is_symlink() and not self._matches_ignore_rules(
+                    path
+                ):
+                    subdirs.append(path)
+                continue
+
+            if self._matches_ignore_rules(path):
+                continue
+            stat_result: Optional[os.stat_result]
+            try:
+                stat_result = entry.stat()
+            except PermissionError:
+                continue
+            except OSError:
+                stat_result = None  # analyze_file reports the error
+            if stat_result is not None and stat_result.st_size > 1024 * 1024:
+                continue  # Skip files > 1MB
+            yield path, stat_result
+
+        for subdir in subdirs:
+            yield from self._walk_files(subdir)
 
     def count_lines(self, filepath: Path) -> int:
         """Count non-empty lines in file.
@@ -144,18 +307,7 @@ class ProjectStructureReporter:
         Returns:
             int: Number of non-empty lines
         """
-        try:
-            # Try to detect if file is binary
-            with open(filepath, "rb") as f:
-                chunk = f.read(1024)
-                if b"\0" in chunk:  # Binary file detection
-                    return 0
-
-            # If not binary, count lines
-            with filepath.open("r", encoding="utf-8") as f:
-                return sum(1 for line in f if line.strip())
-        except (UnicodeDecodeError, OSError):
-            return 0
+        return _count_non_empty_lines(filepath)
 
     def estimate_tokens(self, size_bytes: int) -> int:
         """Estimate number of tokens based on file size.
@@ -168,17 +320,22 @@ class ProjectStructureReporter:
         """
         return size_bytes // 4
 
-    def analyze_file(self, filepath: Path) -> FileData:
+    def analyze_file(
+        self, filepath: Path, stat_result: Optional[os.stat_result] = None
+    ) -> FileData:
         """Analyze single file metrics.
 
         Args:
             filepath: Path to file
+            stat_result: Stat result already taken for filepath, if any
 
         Returns:
             dict: File metrics including size, lines, and tokens
         """
         try:
-            size_bytes = filepath.stat().st_size
+            if stat_result is None:
+                stat_result = filepath.stat()
+            size_bytes = stat_result.st_size
 
             # Skip detailed analysis for large files
             if size_bytes > self.large_file_threshold:
@@ -192,7 +349,10 @@ class ProjectStructureReporter:
                     "error": False,
                 }
 
-            lines = self.count_lines(filepath)
+            # Unchanged files reuse the line count from earlier reports
+            lines = _cached_line_count(
+                str(filepath), stat_result.st_mtime_ns, size_bytes
+            )
             tokens = self.estimate_tokens(size_bytes)
 
             return {
@@ -222,42 +382,32 @@ class ProjectStructureReporter:
         Returns:
             dict: Project metrics including all files and totals
         """
-        report_data: ReportData = {
-            "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "files": [],
-            "total_size": 0,
-            "total_lines": 0,
-            "total_tokens": 0,
-            "large_files": 0,
-            "error_files": 0,
-        }
-
-        for dirpath, dirs, files in os.walk(self.root_dir):
-            current_path = Path(dirpath)
-
-            # Skip ignored directories
-            dirs[:] = [
-                d for d in dirs if not self.should_ignore(current_path / d)
-            ]
-
-            for filename in files:
-                filepath = current_path / filename
-                if self.should_ignore(filepath):
-                    continue
-
-                file_data = self.analyze_file(filepath)
-                report_data["files"].append(file_data)
-
-                report_data["total_size"] += file_data["size_bytes"]
-                if file_data.get("error", False):
-                    report_data["error_files"] += 1
-                elif file_data["is_large"]:
-                    report_data["large_files"] += 1
-                else:
-                    report_data["total_lines"] += file_data["lines"]
-                    report_data["total_tokens"] += file_data["tokens"]
+        last_updated = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+        filepaths: List[Path] = []
+        stat_results: List[Optional[os.stat_result]] = []
+        for filepath, stat_result in self._walk_files(self.root_dir):
+            filepaths.append(filepath)
+            stat_results.append(stat_result)
+
+        # Analyze files on a bounded pool so stat/read latency overlaps;
+        # map() keeps results in walk order
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            files = list(
+                executor.map(self.analyze_file, filepaths, stat_results)
+            )
 
-        return report_data
+        # Large and error entries carry zero lines and tokens, so the
+        # totals can sum over every file
+        return {
+            "last_updated": last_updated,
+            "files": files,
+            "total_size": sum(map(itemgetter("size_bytes"), files)),
+            "total_lines": sum(map(itemgetter("lines"), files)),
+            "total_tokens": sum(map(itemgetter("tokens"), files)),
+            "large_files": sum(map(itemgetter("is_large"), files)),
+            "error_files": sum(map(itemgetter("error"), files)),
+        }
 
     def generate_markdown_report(
         self, report_data: ReportData, output_path: Path
@@ -268,105 +418,103 @@ class ProjectStructureReporter:
             report_data: Analysis results
             output_path: Where to save the report
         """
-        with output_path.open("w", encoding="utf-8") as f:
-            # Header
-            f.write("# Project Structure Report\n\n")
-            f.write(
-                "Description: Project structure analysis with metrics "
-                "and recommendations\n"
+        # Collect the report in memory and join it once
+        parts: List[str] = []
+
+        # Header
+        parts.append("# Project Structure Report\n\n")
+        parts.append(
+            "Description: Project structure analysis with metrics "
+            "and recommendations\n"
+        )
+        parts.append(f"Generated: {report_data['last_updated']}\n\n")
+
+        # Files section with tree structure
+        parts.append("## Project Tree\n\n")
+        files = sorted(report_data["files"], key=lambda x: x["path"])
+
+        # Build tree structure
+        current_path: List[str] = []
+        for file_data in files:
+            path_parts = file_data["path"].split("/")
+
+            # Find common prefix
+            i = 0
+            while i < len(current_path) and i < len(path_parts) - 1:
+                if current_path[i] != path_parts[i]:
+                    break
+                i += 1
+
+            # Remove different parts
+            del current_path[i:]
+
+            # Add new parts
+            while i < len(path_parts) - 1:
+                parts.append("│   " * len(current_path))
+                parts.append("├── " + path_parts[i] + "/\n")
+                current_path.append(path_parts[i])
+                i += 1
+
+            # Write file entry
+            parts.append("│   " * len(current_path))
+            parts.append("├── ")
+            parts.append(self._format_file_entry(file_data))
+
+        # Summary
+        parts.append("\n## Summary\n\n")
+        total_kb = report_data["total_size"] / 1024
+        parts.append("| Metric | Value |\n")
+        parts.append("|--------|-------|\n")
+        parts.append(f"| Total Size | {total_kb:.1f}KB |\n")
+        parts.append(f"| Total Lines | {report_data['total_lines']} |\n")
+        parts.append(f"| Total Tokens | ~{report_data['total_tokens']} |\n")
+        parts.append(f"| Large Files | {report_data['large_files']} |\n")
+        if report_data["error_files"] > 0:
+            parts.append(
+                f"| Files with Errors | {report_data['error_files']} |\n"
             )
-            f.write(f"Generated: {report_data['last_updated']}\n\n")
-
-            # Files section with tree structure
-            f.write("## Project Tree\n\n")
-            files = sorted(report_data["files"], key=lambda x: x["path"])
-
-            # Build tree structure
-            current_path: List[str] = []
-            for file_data in files:
-                parts = file_data["path"].split("/")
-
-                # Find common prefix
-                i = 0
-                while i < len(current_path) and i < len(parts) - 1:
-                    if current_path[i] != parts[i]:
-                        break
-                    i += 1
-
-                # Remove different parts
-                while len(current_path) > i:
-                    current_path.pop()
-
-                # Add new parts
-                while i < len(parts) - 1:
-                    f.write("│   " * len(current_path))
-                    f.write("├── " + parts[i] + "/\n")
-                    current_path.append(parts[i])
-                    i += 1
-
-                # Write file entry
-                f.write("│   " * len(current_path))
-                f.write("├── ")
-                self._write_file_entry(f, file_data, tree_format=True)
-
-            # Summary
-            f.write("\n## Summary\n\n")
-            total_kb = report_data["total_size"] / 1024
-            f.write("| Metric | Value |\n")
-            f.write("|--------|-------|\n")
-            f.write(f"| Total Size | {total_kb:.1f}KB |\n")
-            f.write(f"| Total Lines | {report_data['total_lines']} |\n")
-            f.write(f"| Total Tokens | ~{report_data['total_tokens']} |\n")
-            f.write(f"| Large Files | {report_data['large_files']} |\n")
-            if report_data["error_files"] > 0:
-                f.write(
-                    f"| Files with Errors | {report_data['error_files']} |\n"
-                )
 
-            # Notes
-            f.write("\n## Notes\n\n")
-            f.write("- 📦 File size indicators:\n")
-            f.write("  - Files larger than 1MB are marked as large files\n")
-            f.write(
-                "  - Size is shown in KB for files ≥ 1KB, " "bytes otherwise\n"
-            )
-            f.write("- 📊 Code metrics:\n")
-            f.write("  - 🔴 indicates files with more than 300 lines\n")
-            f.write("  - Token count is estimated (4 chars ≈ 1 token)\n")
-            f.write("  - Empty lines are excluded from line count\n")
-            f.write("- ⚠️ Processing:\n")
-            f.write(
-                "  - Binary files and files with encoding errors "
-                "are skipped\n"
-            )
-            f.write("  - Files matching ignore patterns are excluded\n\n")
+        # Notes
+        parts.append(
+            "\n## Notes\n\n"
+            "- 📦 File size indicators:\n"
+            "  - Files larger than 1MB are marked as large files\n"
+            "  - Size is shown in KB for files ≥ 1KB, bytes otherwise\n"
+            "- 📊 Code metrics:\n"
+            "  - 🔴 indicates files with more than 300 lines\n"
+            "  - Token count is estimated (4 chars ≈ 1 token)\n"
+            "  - Empty lines are excluded from line count\n"
+            "- ⚠️ Processing:\n"
+            "  - Binary files and files with encoding errors are skipped\n"
+            "  - Files matching ignore patterns are excluded\n\n"
+        )
 
-            # Recommendations
-            f.write("## Recommendations\n\n")
-            f.write(
-                "The following files might benefit from being split "
-                "into smaller modules:\n\n"
-            )
-            complex_files = [f for f in files if f["is_complex"]]
-            if complex_files:
-                for file_data in sorted(
-                    complex_files, key=lambda x: x["lines"], reverse=True
-                ):
-                    lines = file_data["lines"]
-                    suggested_modules = self._calculate_suggested_modules(
-                        lines
-                    )
-                    avg_lines = lines // suggested_modules
-                    f.write(f"- {file_data['path']} ({lines} lines) 🔴\n")
-                    f.write(
-                        f"  - Consider splitting into {suggested_modules} "
-                        f"modules of ~{avg_lines} lines each\n"
-                    )
-            else:
-                f.write(
-                    "No files currently exceed the recommended "
-                    "size limit (300 lines).\n"
+        # Recommendations
+        parts.append(
+            "## Recommendations\n\n"
+            "The following files might benefit from being split "
+            "into smaller modules:\n\n"
+        )
+        complex_files = [f for f in files if f["is_complex"]]
+        if complex_files:
+            for file_data in sorted(
+                complex_files, key=lambda x: x["lines"], reverse=True
+            ):
+                lines = file_data["lines"]
+                suggested_modules = self._calculate_suggested_modules(lines)
+                avg_lines = lines // suggested_modules
+                parts.append(f"- {file_data['path']} ({lines} lines) 🔴\n")
+                parts.append(
+                    f"  - Consider splitting into {suggested_modules} "
+                    f"modules of ~{avg_lines} lines each\n"
                 )
+        else:
+            parts.append(
+                "No files currently exceed the recommended "
+                "size limit (300 lines).\n"
+            )
+
+        output_path.write_text("".join(parts), encoding="utf-8")
 
     def _calculate_suggested_modules(self, lines: int) -> int:
         """Calculate suggested number of modules for splitting a file.
@@ -381,14 +529,14 @@ class ProjectStructureReporter:
             lines + self.large_lines_threshold - 1
         ) // self.large_lines_threshold
 
-    def _write_file_entry(
-        self, f: Any, file_data: FileData, tree_format: bool = False
-    ) -> None:
-        """Write a single file entry in the report.
+    def _format_file_entry(self, file_data: FileData) -> str:
+        """Format a single file entry of the report tree.
 
         Args:
-            f: File handle to write to
             file_data: Data for the file entry
+
+        Returns:
+            str: The entry line, including the trailing newline
         """
         size_kb = file_data["size_bytes"] / 1024
         size_str = (
@@ -399,12 +547,11 @@ class ProjectStructureReporter:
 
         filename = file_data["path"].split("/")[-1]
         if file_data.get("error", False):
-            f.write(f"{filename} (⚠️ Error accessing file)\n")
-        elif file_data["is_large"]:
-            f.write(f"{filename} ({size_str}) ⚠️ Large file\n")
-        else:
-            complexity_marker = "🔴" if file_data["is_complex"] else ""
-            f.write(
-                f"{filename} ({size_str}, ~{file_data['tokens']} tokens, "
-                f"{file_data['lines']} lines) {complexity_marker}\n"
-            )
+            return f"{filename} (⚠️ Error accessing file)\n"
+        if file_data["is_large"]:
+            return f"{filename} ({size_str}) ⚠️ Large file\n"
+        complexity_marker = "🔴" if file_data["is_complex"] else ""
+        return (
+            f"{filename} ({size_str}, ~{file_data['tokens']} tokens, "
+            f"{file_data['lines']} lines) {complexity_marker}\n"
+        )
@@ -1,5 +1,6 @@
 """MCP server implementation for code collection."""
 
+import asyncio
 import logging
 import os
 from pathlib import Path
@@ -57,12 +58,17 @@ def create_server() -> FastMCPType:
             )
 
             logger.info("Starting project structure analysis")
-            report_data = reporter.analyze_project_structure()
+            # Walking and writing files blocks; keep the event loop free
+            report_data = await asyncio.to_thread(
+                reporter.analyze_project_structure
+            )
 
             output_path = root_path / ".neurolora" / output_filename
             output_path.parent.mkdir(parents=True, exist_ok=True)
 
-            reporter.generate_markdown_report(report_data, output_path)
+            await asyncio.to_thread(
+                reporter.generate_markdown_report, report_data, output_path
+            )
 
             return f"Project structure report generated: {output_path}"
 
@@ -93,9 +99,6 @@ def create_server() -> FastMCPType:
             )
 
             logger.info("Starting code collection")
-            logger.debug("Input: %s", input_path)
-            logger.debug("Title: %s", title)
-            logger.debug("Subproject ID: %s", subproject_id)
 
             output_file = collector.collect_code(input_path, title)
             if not output_file:
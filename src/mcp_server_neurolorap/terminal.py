@@ -5,6 +5,7 @@ using JSON-RPC protocol in developer mode. It allows executing commands and
 viewing their output directly in the terminal.
 """
 
+import asyncio
 from itertools import count
 from pathlib import Path
 from typing import Any, Dict, Iterator, List, Optional, cast
@@ -264,12 +265,16 @@ class JsonRpcTerminal:
             ignore_patterns=ignore_patterns,
         )
 
-        # Generate report
-        report_data = reporter.analyze_project_structure()
+        # Generate report off the event loop; the walk blocks on file I/O
+        report_data = await asyncio.to_thread(
+            reporter.analyze_project_structure
+        )
 
         output_path = self.project_root / ".neurolora" / output_filename
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        reporter.generate_markdown_report(report_data, output_path)
+        await asyncio.to_thread(
+            reporter.generate_markdown_report, report_data, output_path
+        )
 
         return {"result": f"Project structure report generated: {output_path}"}
 
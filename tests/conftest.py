@@ -1,10 +1,43 @@
 """Common test fixtures and configuration."""
 
+from collections.abc import Callable, Iterator
 from pathlib import Path
 from typing import Generator
 
 import pytest
 
+InputLine = str | BaseException | type[BaseException]
+
+
+@pytest.fixture
+def feed_input(
+    monkeypatch: pytest.MonkeyPatch,
+) -> Callable[..., None]:
+    """Replace input() with a reader over a fixed sequence of lines.
+
+    Exception instances or classes in the sequence are raised instead of
+    returned, which covers interrupts and input errors.
+
+    Args:
+        monkeypatch: pytest's monkeypatch fixture
+
+    Returns:
+        Callable[..., None]: Function taking the lines to feed
+    """
+
+    def _feed(*lines: InputLine) -> None:
+        queue: Iterator[InputLine] = iter(lines)
+
+        def fake_input(prompt: str = "") -> str:
+            line = next(queue)
+            if isinstance(line, str):
+                return line
+            raise line
+
+        monkeypatch.setattr("builtins.input", fake_input)
+
+    return _feed
+
 
 @pytest.fixture
 def temp_dir(tmp_path: Path) -> Generator[Path, None, None]:
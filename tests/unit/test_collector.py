@@ -3,55 +3,86 @@
 import logging
 import os
 from pathlib import Path
-from typing import Any
 from unittest.mock import create_autospec, patch
 
 import pytest
 
 from mcp_server_neurolorap.collector import CodeCollector, LanguageMap
 
+# Read-only sample files shared by the whole session, keyed by the path
+# relative to the case root.
+_CASE_FILES: dict[str, bytes] = {
+    "encodings/utf8_bom.txt": b"\xef\xbb\xbfTest content",
+    "encodings/utf16.txt": "Test content".encode("utf-16"),
+    "encodings/invalid.txt": b"Test content \xff\xff",
+    "binary/test.bin": bytes(range(256)),
+    "large/large.txt": b"0" * (1024 * 1024 + 1),
+}
+
+
+# Written into each test's project_root, since StorageManager.setup()
+# writes into its root.
+_SORTING_FILES = dict.fromkeys(
+    ["b.py", "a.py", "PROJECT_SUMMARY.md", "src/test.py", "README.md"],
+    b"Test content",
+)
 
-def test_language_map() -> None:
-    """Test LanguageMap extension to language mapping."""
-    test_cases = [
-        ("test.py", "python"),
-        ("test.js", "javascript"),
-        ("test.ts", "typescript"),
-        ("test.jsx", "jsx"),
-        ("test.tsx", "tsx"),
-        ("test.html", "html"),
-        ("test.css", "css"),
-        ("test.md", "markdown"),
-        ("test.json", "json"),
-        ("test.yml", "yaml"),
-        ("test.yaml", "yaml"),
-        ("test.sh", "bash"),
-        ("test.unknown", ""),  # Unknown extension
-        ("test", ""),  # No extension
-        ("TEST.PY", "python"),  # Case insensitive
-    ]
 
-    for filename, expected_lang in test_cases:
-        assert LanguageMap.get_language(Path(filename)) == expected_lang
+def _write_files(root: Path, files: dict[str, bytes]) -> None:
+    """Write files keyed by their path relative to root."""
+    for relative_path, data in files.items():
+        path = root / relative_path
+        os.makedirs(path.parent, exist_ok=True)
+        path.write_bytes(data)
+
+
+@pytest.fixture(scope="session")
+def collector_cases(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Materialize the shared sample files once per test session.
+
+    Tests using this tree must not modify it.
+    """
+    root = tmp_path_factory.mktemp("collector_cases")
+    _write_files(root, _CASE_FILES)
+    return root
+
+
+_LANG_CASES = [
+    ("test.py", "python"),
+    ("test.js", "javascript"),
+    ("test.ts", "typescript"),
+    ("test.jsx", "jsx"),
+    ("test.tsx", "tsx"),
+    ("test.html", "html"),
+    ("test.css", "css"),
+    ("test.md", "markdown"),
+    ("test.json", "json"),
+    ("test.yml", "yaml"),
+    ("test.yaml", "yaml"),
+    ("test.sh", "bash"),
+    ("test.unknown", ""),  # Unknown extension
+    ("test", ""),  # No extension
+    ("TEST.PY", "python"),  # Case insensitive
+]
+
+
+@pytest.mark.parametrize("filename,expected_lang", _LANG_CASES)
+def test_language_map(filename: str, expected_lang: str) -> None:
+    """Test LanguageMap extension to language mapping."""
+    assert LanguageMap.get_language(Path(filename)) == expected_lang
 
 
 def test_collect_files_with_spaces(project_root: Path) -> None:
     """Test collecting files with spaces in paths."""
-    # Create test files
     space_dir = project_root / "test dir"
-    space_dir.mkdir(exist_ok=True)
     space_file = space_dir / "test file.py"
-    space_file.write_text("Test content")
+    _write_files(project_root, {"test dir/test file.py": b"Test content"})
 
     collector = CodeCollector(project_root)
     files = collector.collect_files(str(space_dir))
 
     assert space_file in files
 
-    # Cleanup
-    space_file.unlink()
-    space_dir.rmdir()
-
 
 def test_collect_files_absolute_path(project_root: Path) -> None:
     """Test collecting files with absolute paths."""
@@ -80,34 +111,29 @@ def test_collect_files_absolute_path(project_root: Path) -> None:
     outside_dir.rmdir()
 
 
-def test_read_file_content_encodings(project_root: Path) -> None:
+def test_read_file_content_encodings(
+    project_root: Path, collector_cases: Path
+) -> None:
     """Test reading files with different encodings."""
     collector = CodeCollector(project_root)
+    encodings_dir = collector_cases / "encodings"
 
     # UTF-8 with BOM
-    utf8_bom_file = project_root / "utf8_bom.txt"
-    utf8_bom_file.write_bytes(b"\xef\xbb\xbfTest content")
+    utf8_bom_file = encodings_dir / "utf8_bom.txt"
     assert "Test content" in collector.read_file_content(utf8_bom_file)
 
     # UTF-16
-    utf16_file = project_root / "utf16.txt"
-    utf16_file.write_text("Test content", encoding="utf-16")
+    utf16_file = encodings_dir / "utf16.txt"
     assert "[Binary file content not shown]" == collector.read_file_content(
         utf16_file
     )
 
     # Invalid UTF-8
-    invalid_file = project_root / "invalid.txt"
-    invalid_file.write_bytes(b"Test content \xff\xff")
+    invalid_file = encodings_dir / "invalid.txt"
     assert "[Binary file content not shown]" == collector.read_file_content(
         invalid_file
     )
 
-    # Cleanup
-    utf8_bom_file.unlink()
-    utf16_file.unlink()
-    invalid_file.unlink()
-
 
 def test_read_file_content_errors(project_root: Path) -> None:
     """Test error handling when reading files."""
@@ -159,6 +185,33 @@ def test_collect_code_output_files(project_root: Path) -> None:
     test_file.unlink()
 
 
+def test_collect_code_single_directory_sync(
+    project_root: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that each output file and their directory are fsynced once."""
+    collector = CodeCollector(project_root)
+    test_file = project_root / "test.py"
+    test_file.write_text("Test content")
+
+    fsync_mock = create_autospec(os.fsync, return_value=None)
+    sync_mock = create_autospec(os.sync, return_value=None)
+    monkeypatch.setattr(os, "fsync", fsync_mock)
+    monkeypatch.setattr(os, "sync", sync_mock)
+
+    output_path = collector.collect_code(str(test_file))
+    assert output_path is not None
+
+    # One fsync per output file, plus one for the shared directory
+    assert fsync_mock.call_count == 3
+    sync_mock.assert_not_called()
+
+    # Analysis file holds the prompt followed by the collected code
+    analysis_path = output_path.parent / output_path.name.replace(
+        "FULL_CODE_", "PROMPT_ANALYZE_"
+    )
+    assert analysis_path.read_text().endswith(output_path.read_text())
+
+
 def test_init_with_project_root(project_root: Path) -> None:
     """Test initializing CodeCollector with project root."""
     collector = CodeCollector(project_root)
@@ -223,6 +276,44 @@ def test_collect_files(project_root: Path, sample_files: list[Path]) -> None:
     assert project_root / "src" / "main.py" in files
 
 
+def test_collect_files_follows_retargeted_symlink(project_root: Path) -> None:
+    """Test that a reused collector re-resolves input paths on each call."""
+    collector = CodeCollector(project_root)
+    first = project_root / "first.py"
+    second = project_root / "second.py"
+    first.write_text("Test content")
+    second.write_text("Test content")
+    link = project_root / "link.py"
+
+    link.symlink_to(first)
+    assert collector.collect_files("link.py") == [first]
+
+    link.unlink()
+    link.symlink_to(second)
+    assert collector.collect_files("link.py") == [second]
+
+
+def test_collect_files_nested_directories(project_root: Path) -> None:
+    """Test walking nested directories, pruning ignored ones."""
+    collector = CodeCollector(project_root)
+    collector.ignore_patterns = ["skip/"]
+
+    expected = [
+        project_root / "a" / "one.py",
+        project_root / "a" / "b" / "two.py",
+        project_root / "a" / "b" / "c" / "three.py",
+        project_root / "d" / "four.py",
+    ]
+    for path in expected + [project_root / "a" / "skip" / "hidden.py"]:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("Test content")
+    (project_root / "link").symlink_to(project_root / "a")
+
+    files = collector.collect_files(str(project_root))
+
+    assert sorted(files) == sorted(expected)
+
+
 def test_collect_files_nonexistent(project_root: Path) -> None:
     """Test collecting files from nonexistent paths."""
     collector = CodeCollector(project_root)
@@ -247,8 +338,6 @@ def test_read_file_content(
 
 def test_make_anchor() -> None:
     """Test markdown anchor generation."""
-    collector = CodeCollector()
-
     test_cases = [
         ("src/test.py", "src-test-py"),
         ("test file.js", "test-file-js"),
@@ -257,7 +346,7 @@ def test_make_anchor() -> None:
     ]
 
     for path, expected in test_cases:
-        assert collector.make_anchor(Path(path)) == expected
+        assert CodeCollector.make_anchor(Path(path)) == expected
 
 
 @pytest.mark.parametrize(
@@ -334,17 +423,13 @@ def test_collect_code_error_handling(
     error_type: type[Exception],
     error_msg: str,
     expected_log: str,
-    monkeypatch: pytest.MonkeyPatch,
 ) -> None:
     """Test error handling during code collection."""
     collector = CodeCollector(project_root)
 
-    def mock_collect_files(*args: Any, **kwargs: Any) -> list[Path]:
-        raise error_type(error_msg)
-
-    monkeypatch.setattr(collector, "collect_files", mock_collect_files)
-
-    with caplog.at_level(logging.ERROR):
+    with patch.object(
+        collector, "collect_files", side_effect=error_type(error_msg)
+    ), caplog.at_level(logging.ERROR):
         result = collector.collect_code("test_input")
         assert result is None
         assert expected_log in caplog.text
@@ -354,34 +439,29 @@ def test_collect_code_error_handling(
         assert len(output_files) == 0
 
 
-def test_large_file_handling(project_root: Path) -> None:
+def test_large_file_handling(
+    project_root: Path, collector_cases: Path
+) -> None:
     """Test handling of large files."""
     collector = CodeCollector(project_root)
 
-    # Create a large file (>1MB)
-    large_file = project_root / "large.txt"
-    large_file.write_bytes(b"0" * (1024 * 1024 + 1))
+    # Large file (>1MB)
+    large_file = collector_cases / "large" / "large.txt"
 
     assert collector.should_ignore_file(large_file)
 
-    # Cleanup
-    large_file.unlink()
-
 
-def test_binary_file_handling(project_root: Path) -> None:
+def test_binary_file_handling(
+    project_root: Path, collector_cases: Path
+) -> None:
     """Test handling of binary files."""
     collector = CodeCollector(project_root)
 
-    # Create a binary file
-    binary_file = project_root / "test.bin"
-    binary_file.write_bytes(bytes(range(256)))
+    binary_file = collector_cases / "binary" / "test.bin"
 
     content = collector.read_file_content(binary_file)
     assert content == "[Binary file content not shown]"
 
-    # Cleanup
-    binary_file.unlink()
-
 
 def test_should_ignore_file_special_cases(project_root: Path) -> None:
     """Test special cases for file ignore logic."""
@@ -465,16 +545,9 @@ def test_collect_files_error_handling(project_root: Path) -> None:
 
 def test_collect_files_sorting(project_root: Path) -> None:
     """Test file sorting in collect_files."""
+    _write_files(project_root, _SORTING_FILES)
     collector = CodeCollector(project_root)
 
-    # Create test files
-    files = ["b.py", "a.py", "PROJECT_SUMMARY.md", "src/test.py", "README.md"]
-
-    for file in files:
-        path = project_root / file
-        path.parent.mkdir(exist_ok=True)
-        path.write_text("Test content")
-
     collected = collector.collect_files(str(project_root))
 
     # PROJECT_SUMMARY.md should be first
@@ -483,10 +556,3 @@ def test_collect_files_sorting(project_root: Path) -> None:
     # Other files should be sorted alphabetically
     sorted_names = [f.name for f in collected[1:]]
     assert sorted_names == ["README.md", "a.py", "b.py", "test.py"]
-
-    # Cleanup
-    for file in files:
-        path = project_root / file
-        path.unlink()
-        if path.parent != project_root:
-            path.parent.rmdir()
@@ -1,68 +1,128 @@
 """Unit tests for the main module."""
 
+import copy
 import json
+import os
 import signal
 import sys
+from contextlib import ExitStack
 from pathlib import Path
-from types import FrameType
+from types import FrameType, SimpleNamespace
 from typing import Generator
-from unittest.mock import AsyncMock, MagicMock, Mock, patch
+from unittest.mock import MagicMock, Mock, patch
 
 import pytest
 
 # Import the module to ensure coverage is tracked
+import mcp_server_neurolorap.__main__ as mainmod
 from mcp_server_neurolorap.__main__ import (
     ClinesConfig,
+    _build_or_update_config,
     configure_cline,
     handle_shutdown,
     main,
     main_entry,
 )
 
+# Module attributes replaced by the patched_main fixture
+_MAIN_COLLABORATORS = (
+    "asyncio",
+    "configure_cline",
+    "create_server",
+    "logger",
+    "run_dev_mode",
+    "signal",
+)
+
+# Stale server entry that configure_cline is expected to overwrite
+_INITIAL_CONFIG: ClinesConfig = {
+    "mcpServers": {
+        "aindreyway-mcp-neurolorap": {
+            "command": "old_command",
+            "args": ["old_arg"],
+            "disabled": True,
+            "alwaysAllow": [],
+            "env": {"OLD_VAR": "old_value"},
+        }
+    }
+}
+
+
+def _current_config(project_root: Path) -> ClinesConfig:
+    """Build the configuration configure_cline writes for project_root."""
+    return {
+        "mcpServers": {
+            "aindreyway-mcp-neurolorap": {
+                "command": sys.executable,
+                "args": ["-m", "mcp_server_neurolorap"],
+                "disabled": False,
+                "alwaysAllow": [],
+                "env": {
+                    "PYTHONPATH": str(project_root),
+                    "PYTHONUNBUFFERED": "1",
+                    "MCP_PROJECT_ROOT": str(project_root),
+                },
+            }
+        }
+    }
+
 
 @pytest.fixture
-def mock_config_path(tmp_path: Path) -> Generator[Path, None, None]:
+def mock_config_path(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
     """Create a temporary config path."""
-    config_path = tmp_path / "cline_mcp_settings.json"
-    config_path.parent.mkdir(parents=True, exist_ok=True)
-    mock_home = Mock()
-    mock_home.return_value = tmp_path.parent
-    with patch("mcp_server_neurolorap.__main__.Path.home", mock_home):
-        yield config_path
+    home = tmp_path.parent
+    monkeypatch.setattr(Path, "home", lambda: home)
+    return tmp_path / "cline_mcp_settings.json"
 
 
-@pytest.fixture
-def mock_project_root(tmp_path: Path) -> Generator[Path, None, None]:
-    """Create a temporary project root."""
-    project_path = tmp_path / "src" / "mcp_server_neurolorap"
-    project_path.mkdir(parents=True, exist_ok=True)
-    main_file = project_path / "__main__.py"
-    main_file.touch()
+@pytest.fixture(scope="module")
+def project_tree(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Create a read-only project root shared by the module's tests."""
+    root = tmp_path_factory.mktemp("project")
+    project_path = root / "src" / "mcp_server_neurolorap"
+    os.makedirs(project_path, exist_ok=True)
+    open(project_path / "__main__.py", "wb").close()
+    return root
+
 
-    def mock_path_factory(*args: str, **kwargs: str) -> MagicMock:
-        mock_instance = MagicMock(spec=Path)
-        mock_instance.resolve.return_value = main_file
-        mock_instance.parent.parent.parent = tmp_path
-        # Configure __str__ as a property
-        mock_instance.configure_mock(**{"__str__": str(main_file)})
-        return mock_instance
+@pytest.fixture
+def mock_project_root(
+    project_tree: Path, monkeypatch: pytest.MonkeyPatch
+) -> Path:
+    """Point configure_cline's project root lookup at the shared tree."""
+    main_file = project_tree / "src" / "mcp_server_neurolorap" / "__main__.py"
+    monkeypatch.setattr(mainmod, "__file__", str(main_file))
+    return main_file.resolve().parent.parent.parent
 
-    mock_path = MagicMock()
-    mock_path.side_effect = mock_path_factory
 
-    with patch("mcp_server_neurolorap.__main__.Path", mock_path):
-        yield tmp_path
+@pytest.fixture
+def patched_main(
+    monkeypatch: pytest.MonkeyPatch,
+) -> Generator[SimpleNamespace, None, None]:
+    """Patch every collaborator of main() in one place.
+
+    Tests adjust return values and side effects on the yielded mocks
+    instead of stacking their own patches.
+    """
+    monkeypatch.setattr(sys, "argv", ["script.py"])
+    with ExitStack() as stack:
+        yield SimpleNamespace(
+            **{
+                name: stack.enter_context(
+                    patch.object(mainmod, name, new_callable=MagicMock)
+                )
+                for name in _MAIN_COLLABORATORS
+            }
+        )
 
 
 def test_handle_shutdown() -> None:
     """Test shutdown signal handler."""
     frame = Mock(spec=FrameType)
     # Reset shutdown_requested before test
-    import mcp_server_neurolorap.__main__
-
-    mcp_server_neurolorap.__main__.shutdown_requested = False
+    mainmod.shutdown_requested = False
     handle_shutdown(signal.SIGTERM, frame)
-    assert mcp_server_neurolorap.__main__.shutdown_requested is True
+    assert mainmod.shutdown_requested is True
 
 
 def test_configure_cline_new_config(
@@ -83,27 +143,11 @@ def test_configure_cline_new_config(
     assert server_config["env"]["PYTHONPATH"] == str(mock_project_root)
 
 
-def test_configure_cline_update_config(
-    mock_config_path: Path, mock_project_root: Path
-) -> None:
-    """Test updating existing Cline configuration."""
-    # Create initial config
-    initial_config: ClinesConfig = {
-        "mcpServers": {
-            "aindreyway-mcp-neurolorap": {
-                "command": "old_command",
-                "args": ["old_arg"],
-                "disabled": True,
-                "alwaysAllow": [],
-                "env": {"OLD_VAR": "old_value"},
-            }
-        }
-    }
-    mock_config_path.write_text(json.dumps(initial_config))
-
-    configure_cline(mock_config_path)
+def test_build_or_update_config_update(mock_project_root: Path) -> None:
+    """Test updating an existing server entry in memory."""
+    config, changed = _build_or_update_config(copy.deepcopy(_INITIAL_CONFIG))
 
-    config = json.loads(mock_config_path.read_text())
+    assert changed is True
     server_config = config["mcpServers"]["aindreyway-mcp-neurolorap"]
     assert server_config["command"] == sys.executable
     assert server_config["args"] == ["-m", "mcp_server_neurolorap"]
@@ -111,33 +155,15 @@ def test_configure_cline_update_config(
     assert server_config["env"]["PYTHONPATH"] == str(mock_project_root)
 
 
-def test_configure_cline_no_change(
-    mock_config_path: Path, mock_project_root: Path
-) -> None:
+def test_build_or_update_config_no_change(mock_project_root: Path) -> None:
     """Test configuration when no changes needed."""
-    # Create config with current values
-    current_config: ClinesConfig = {
-        "mcpServers": {
-            "aindreyway-mcp-neurolorap": {
-                "command": sys.executable,
-                "args": ["-m", "mcp_server_neurolorap"],
-                "disabled": False,
-                "alwaysAllow": [],
-                "env": {
-                    "PYTHONPATH": str(mock_project_root),
-                    "PYTHONUNBUFFERED": "1",
-                    "MCP_PROJECT_ROOT": str(mock_project_root),
-                },
-            }
-        }
-    }
-    mock_config_path.write_text(json.dumps(current_config))
+    current_config = _current_config(mock_project_root)
 
-    with patch("mcp_server_neurolorap.__main__.logger") as mock_logger:
-        configure_cline(mock_config_path)
-        mock_logger.info.assert_called_with(
-            "Server already configured in Cline"
-        )
+    with patch.object(mainmod, "logger") as mock_logger:
+        config, changed = _build_or_update_config(current_config)
+    assert changed is False
+    assert config is current_config
+    mock_logger.info.assert_called_with("Server already configured in Cline")
 
 
 def test_configure_cline_error() -> None:
@@ -145,67 +171,61 @@ def test_configure_cline_error() -> None:
     with patch(
         "mcp_server_neurolorap.__main__.Path.home",
         side_effect=Exception("Test error"),
-    ), patch("mcp_server_neurolorap.__main__.logger") as mock_logger:
+    ), patch.object(mainmod, "logger") as mock_logger:
         configure_cline()
         mock_logger.warning.assert_called_with(
             "Failed to configure Cline: Test error"
         )
 
 
-def test_main_dev_mode() -> None:
+def test_main_dev_mode(
+    patched_main: SimpleNamespace, monkeypatch: pytest.MonkeyPatch
+) -> None:
     """Test running server in developer mode."""
-    mock_dev_mode = AsyncMock()
-    with patch("sys.argv", ["script.py", "--dev"]), patch(
-        "mcp_server_neurolorap.__main__.run_dev_mode",
-        return_value=mock_dev_mode(),
-    ), patch("mcp_server_neurolorap.__main__.asyncio.run") as mock_run:
-        main()
-        mock_run.assert_called_once()
+    monkeypatch.setattr(sys, "argv", ["script.py", "--dev"])
+    main()
+    patched_main.asyncio.run.assert_called_once()
+    patched_main.configure_cline.assert_not_called()
 
 
-def test_main_normal_mode() -> None:
+def test_main_normal_mode(patched_main: SimpleNamespace) -> None:
     """Test running server in normal mode."""
-    mock_server = MagicMock()
-    with patch("sys.argv", ["script.py"]), patch(
-        "mcp_server_neurolorap.__main__.create_server",
-        return_value=mock_server,
-    ), patch(
-        "mcp_server_neurolorap.__main__.configure_cline"
-    ) as mock_configure:
-        main()
-        mock_configure.assert_called_once()
-        mock_server.run.assert_called_once()
+    main()
+    patched_main.configure_cline.assert_called_once()
+    patched_main.create_server.return_value.run.assert_called_once()
 
 
-def test_main_error() -> None:
+def test_main_error(patched_main: SimpleNamespace) -> None:
     """Test error handling in main."""
-    with patch(
-        "mcp_server_neurolorap.__main__.create_server",
-        side_effect=Exception("Test error"),
-    ), patch("mcp_server_neurolorap.__main__.logger") as mock_logger:
-        with pytest.raises(SystemExit) as exc_info:
-            main()
-            assert exc_info.value.code == 1
-            mock_logger.exception.assert_called()
-
-
-def test_main_entry_keyboard_interrupt() -> None:
-    """Test handling keyboard interrupt in main_entry."""
-    with patch(
-        "mcp_server_neurolorap.__main__.main",
-        side_effect=KeyboardInterrupt,
-    ), patch("mcp_server_neurolorap.__main__.logger") as mock_logger:
-        main_entry()
-        mock_logger.info.assert_called_with("Server stopped by user")
+    patched_main.create_server.side_effect = Exception("Test error")
+    with pytest.raises(SystemExit) as exc_info:
+        main()
+    assert exc_info.value.code == 1
+    patched_main.logger.exception.assert_called_once()
 
 
-def test_main_entry_error() -> None:
-    """Test error handling in main_entry."""
-    with patch(
-        "mcp_server_neurolorap.__main__.main",
-        side_effect=Exception("Test error"),
-    ), patch("mcp_server_neurolorap.__main__.logger") as mock_logger:
-        with pytest.raises(SystemExit) as exc_info:
+@pytest.mark.parametrize(
+    "error,exit_code,log_method,log_message",
+    [
+        (KeyboardInterrupt, None, "info", "Server stopped by user"),
+        (Exception("Test error"), 1, "exception", "Server error"),
+    ],
+    ids=["keyboard_interrupt", "error"],
+)
+def test_main_entry(
+    error: BaseException | type[BaseException],
+    exit_code: int | None,
+    log_method: str,
+    log_message: str,
+) -> None:
+    """Test main_entry's handling of interrupts and errors from main."""
+    with patch.object(mainmod, "main", side_effect=error), patch.object(
+        mainmod, "logger"
+    ) as mock_logger:
+        if exit_code is None:
             main_entry()
-            assert exc_info.value.code == 1
-            mock_logger.exception.assert_called_with("Server error")
+        else:
+            with pytest.raises(SystemExit) as exc_info:
+                main_entry()
+            assert exc_info.value.code == exit_code
+    getattr(mock_logger, log_method).assert_called_with(log_message)
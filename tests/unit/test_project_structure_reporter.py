@@ -2,26 +2,43 @@
 
 import os
 from pathlib import Path
-from typing import Generator
+from unittest.mock import patch
 
 import pytest
 
+import mcp_server_neurolorap.project_structure_reporter as reporter_module
 from mcp_server_neurolorap.project_structure_reporter import (
     ProjectStructureReporter,
 )
 
+# Project tree shared by the module's tests: relative path -> content
+_PROJECT_FILES = {
+    "src/main.py": b"def main():\n    pass\n",
+    "src/utils.py": b"x = 1\n" * 400,  # Large file
+    "README.md": b"# Test Project\n",
+    "binary.bin": b"\x00\x01\x02\x03",
+}
+
+
+def _write_project(root: Path) -> Path:
+    """Write the shared project tree below root."""
+    for relative_path, content in _PROJECT_FILES.items():
+        filepath = root / relative_path
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        filepath.write_bytes(content)
+    return root
 
-@pytest.fixture
-def temp_project(tmp_path: Path) -> Generator[Path, None, None]:
-    """Create a temporary project structure for testing."""
-    # Create some test files
-    (tmp_path / "src").mkdir()
-    (tmp_path / "src" / "main.py").write_text("def main():\n    pass\n")
-    (tmp_path / "src" / "utils.py").write_text("x = 1\n" * 400)  # Large file
-    (tmp_path / "README.md").write_text("# Test Project\n")
-    (tmp_path / "binary.bin").write_bytes(b"\x00\x01\x02\x03")
 
-    yield tmp_path
+@pytest.fixture(scope="module")
+def temp_project(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Create a read-only project structure shared by the module."""
+    return _write_project(tmp_path_factory.mktemp("project"))
+
+
+@pytest.fixture
+def writable_project(tmp_path: Path) -> Path:
+    """Create a private project structure for tests that modify it."""
+    return _write_project(tmp_path)
 
 
 def test_should_ignore(temp_project: Path) -> None:
@@ -36,6 +53,64 @@ def test_should_ignore(temp_project: Path) -> None:
     assert not reporter.should_ignore(temp_project / "src" / "main.py")
 
 
+def test_should_ignore_directory_and_path_patterns(
+    temp_project: Path,
+) -> None:
+    """Test directory patterns and globs matched against relative paths."""
+    reporter = ProjectStructureReporter(
+        root_dir=temp_project,
+        ignore_patterns=["build/", "src/*.txt"],
+    )
+
+    assert reporter.should_ignore(temp_project / "build" / "out.py")
+    assert reporter.should_ignore(temp_project / "src" / "build" / "x.py")
+    assert reporter.should_ignore(temp_project / "src" / "notes.txt")
+    assert not reporter.should_ignore(temp_project / "notes.txt")
+    assert not reporter.should_ignore(temp_project / "builder.py")
+
+
+def test_should_ignore_literal_patterns(temp_project: Path) -> None:
+    """Test glob-free patterns match whole names or relative paths."""
+    reporter = ProjectStructureReporter(
+        root_dir=temp_project,
+        ignore_patterns=[".DS_Store", "src/main.py", "*.bin"],
+    )
+
+    assert reporter.should_ignore(temp_project / "src" / ".DS_Store")
+    assert reporter.should_ignore(temp_project / "src" / "main.py")
+    assert reporter.should_ignore(temp_project / "binary.bin")
+    assert not reporter.should_ignore(temp_project / "main.py")
+    assert not reporter.should_ignore(temp_project / "x.DS_Store")
+
+
+def test_ignore_patterns_compiled_once(temp_project: Path) -> None:
+    """Test reporters with the same patterns share the compiled regex."""
+    first = ProjectStructureReporter(
+        root_dir=temp_project, ignore_patterns=["*.log", "dist/"]
+    )
+    second = ProjectStructureReporter(
+        root_dir=temp_project / "src", ignore_patterns=["*.log", "dist/"]
+    )
+
+    assert first._ignore_re is not None
+    assert first._ignore_re is second._ignore_re
+
+
+def test_should_ignore_case_folding(
+    temp_project: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test names are case-folded before matching where the OS folds."""
+    monkeypatch.setattr(reporter_module, "_FOLD_CASE", True)
+    monkeypatch.setattr(reporter_module, "_normcase", str.lower)
+    reporter = ProjectStructureReporter(
+        root_dir=temp_project,
+        ignore_patterns=["*.pyc"],
+    )
+
+    assert reporter.should_ignore(temp_project / "CACHE.PYC")
+    assert not reporter.should_ignore(temp_project / "MAIN.PY")
+
+
 def test_count_lines(temp_project: Path) -> None:
     """Test line counting functionality."""
     reporter = ProjectStructureReporter(root_dir=temp_project)
@@ -45,6 +120,53 @@ def test_count_lines(temp_project: Path) -> None:
     assert reporter.count_lines(temp_project / "binary.bin") == 0
 
 
+@pytest.mark.parametrize(
+    "content,expected",
+    [
+        (b"", 0),
+        (b"a\n\n  \n\tb\n", 2),
+        (b"a\r\nb\r\n\r\n", 2),
+        (b"a\rb\r \r", 2),
+        (b"no trailing newline", 1),
+        (b"\xff\xfe invalid utf-8", 0),
+        (b"text\n" * 1000 + b"\0", 0),
+        (b"text\n" * 2000 + b"\0", 2001),
+    ],
+    ids=[
+        "empty",
+        "blank",
+        "crlf",
+        "cr",
+        "no_newline",
+        "invalid",
+        "nul_in_head",
+        "nul_after_head",
+    ],
+)
+def test_count_lines_non_empty(
+    tmp_path: Path, content: bytes, expected: int
+) -> None:
+    """Test only non-empty lines count, across newline styles."""
+    reporter = ProjectStructureReporter(root_dir=tmp_path)
+    filepath = tmp_path / "sample.txt"
+    filepath.write_bytes(content)
+
+    assert reporter.count_lines(filepath) == expected
+
+
+def test_estimate_tokens(temp_project: Path) -> None:
+    """Test token estimation is derived from size without reading files."""
+    reporter = ProjectStructureReporter(root_dir=temp_project)
+
+    assert reporter.estimate_tokens(0) == 0
+    assert reporter.estimate_tokens(3) == 0
+    assert reporter.estimate_tokens(100) == 25
+
+    size = (temp_project / "src" / "utils.py").stat().st_size
+    utils_data = reporter.analyze_file(temp_project / "src" / "utils.py")
+    assert utils_data["tokens"] == size // 4
+
+
 def test_analyze_file(temp_project: Path) -> None:
     """Test file analysis functionality."""
     reporter = ProjectStructureReporter(root_dir=temp_project)
@@ -74,6 +196,23 @@ def test_analyze_file(temp_project: Path) -> None:
     assert not binary_data["error"]
 
 
+def test_analyze_file_cache(writable_project: Path) -> None:
+    """Test line counts persist across reporters until a file changes."""
+    main_py = writable_project / "src" / "main.py"
+
+    first = ProjectStructureReporter(root_dir=writable_project)
+    assert first.analyze_file(main_py)["lines"] == 2
+
+    # A new reporter, as each tool call creates, reuses the count
+    second = ProjectStructureReporter(root_dir=writable_project)
+    with patch.object(reporter_module, "_count_non_empty_lines") as count:
+        assert second.analyze_file(main_py)["lines"] == 2
+        count.assert_not_called()
+
+    main_py.write_text("def main():\n    pass\n\nmain()\n")
+    assert second.analyze_file(main_py)["lines"] == 3
+
+
 def test_analyze_project_structure(temp_project: Path) -> None:
     """Test project structure analysis."""
     reporter = ProjectStructureReporter(
@@ -90,12 +229,82 @@ def test_analyze_project_structure(temp_project: Path) -> None:
     assert report_data["error_files"] == 0
 
 
-def test_generate_markdown_report(temp_project: Path) -> None:
+def test_analyze_project_structure_walk(tmp_path: Path) -> None:
+    """Test the walk prunes ignored dirs, skips big files and symlinks."""
+    (tmp_path / "pkg" / "sub").mkdir(parents=True)
+    (tmp_path / "pkg" / "a.py").write_text("a = 1\n")
+    (tmp_path / "pkg" / "sub" / "b.py").write_text("b = 2\n")
+    (tmp_path / "node_modules").mkdir()
+    (tmp_path / "node_modules" / "dep.js").write_text("x\n")
+    (tmp_path / "big.txt").write_bytes(b"x" * (1024 * 1024 + 1))
+    (tmp_path / "FULL_CODE_pkg.md").write_text("generated\n")
+    (tmp_path / "linked").symlink_to(
+        tmp_path / "pkg", target_is_directory=True
+    )
+
+    reporter = ProjectStructureReporter(
+        root_dir=tmp_path, ignore_patterns=["node_modules/"]
+    )
+    with patch(
+        "mcp_server_neurolorap.project_structure_reporter.os.scandir",
+        wraps=os.scandir,
+    ) as scandir:
+        report_data = reporter.analyze_project_structure()
+
+    scanned = {Path(c.args[0]).name for c in scandir.call_args_list}
+    assert "node_modules" not in scanned
+
+    assert sorted(f["path"] for f in report_data["files"]) == [
+        os.path.join("pkg", "a.py"),
+        os.path.join("pkg", "sub", "b.py"),
+    ]
+    assert report_data["total_lines"] == 2
+
+
+def test_analyze_project_structure_totals(writable_project: Path) -> None:
+    """Test totals skip error and large entries but count their files."""
+    (writable_project / "dangling.py").symlink_to(
+        writable_project / "missing.py"
+    )
+    reporter = ProjectStructureReporter(
+        root_dir=writable_project, ignore_patterns=["*.bin"]
+    )
+    reporter.large_file_threshold = 1024  # Make utils.py a large file
+
+    report_data = reporter.analyze_project_structure()
+
+    assert len(report_data["files"]) == 4
+    assert report_data["error_files"] == 1
+    assert report_data["large_files"] == 1
+    assert report_data["total_lines"] == 3  # main.py and README.md
+    assert report_data["total_size"] == sum(
+        f["size_bytes"] for f in report_data["files"]
+    )
+
+
+def test_analyze_project_structure_worker_count(temp_project: Path) -> None:
+    """Test concurrent analysis matches a single-worker run."""
+    concurrent_data = ProjectStructureReporter(
+        root_dir=temp_project
+    ).analyze_project_structure()
+
+    # Clear cached line counts so the serial pass recounts every file
+    reporter_module._cached_line_count.cache_clear()
+    serial_reporter = ProjectStructureReporter(root_dir=temp_project)
+    serial_reporter.max_workers = 1
+    serial_data = serial_reporter.analyze_project_structure()
+
+    assert concurrent_data["files"] == serial_data["files"]
+    assert concurrent_data["total_lines"] == serial_data["total_lines"]
+    assert concurrent_data["total_tokens"] == serial_data["total_tokens"]
+
+
+def test_generate_markdown_report(temp_project: Path, tmp_path: Path) -> None:
     """Test markdown report generation."""
     reporter = ProjectStructureReporter(root_dir=temp_project)
     report_data = reporter.analyze_project_structure()
 
-    output_path = temp_project / "report.md"
+    output_path = tmp_path / "report.md"
     reporter.generate_markdown_report(report_data, output_path)
 
     assert output_path.exists()
@@ -104,3 +313,10 @@ def test_generate_markdown_report(temp_project: Path) -> None:
     assert "## Project Tree" in content
     assert "## Summary" in content
     assert "## Notes" in content
+    assert "├── src/\n│   ├── main.py (" in content
+    assert "utils.py (2.3KB, ~600 tokens, 400 lines) 🔴\n" in content
+    assert "| Total Lines | 403 |\n" in content
+    assert (
+        "- src/utils.py (400 lines) 🔴\n"
+        "  - Consider splitting into 2 modules of ~200 lines each\n"
+    ) in content
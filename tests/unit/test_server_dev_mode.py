@@ -1,17 +1,33 @@
 """Unit tests for developer mode functionality."""
 
-from collections.abc import Generator
+from collections.abc import Callable, Generator
+from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+import mcp_server_neurolorap.server as server_module
 from mcp_server_neurolorap.server import run_dev_mode
 
+# Shared, never mutated by run_dev_mode
+_EXIT_REQUEST: dict[str, Any] = {"jsonrpc": "2.0", "method": "exit", "id": 1}
+_GOODBYE_RESPONSE: dict[str, Any] = {
+    "jsonrpc": "2.0",
+    "result": "Goodbye!",
+    "id": 1,
+}
 
-@pytest.fixture
+_ERROR_CASES: list[tuple[type[Exception], str]] = [
+    (ValueError, "Value error: Invalid command"),
+    (TypeError, "Type error: Invalid command"),
+    (Exception, "Unexpected error: Invalid command"),
+]
+
+
+@pytest.fixture(scope="module")
 def mock_terminal_fixture() -> Generator[MagicMock, None, None]:
     """Mock terminal fixture."""
-    with patch("mcp_server_neurolorap.server.JsonRpcTerminal") as mock_class:
+    with patch.object(server_module, "JsonRpcTerminal") as mock_class:
         mock_instance = MagicMock()
         mock_instance.parse_request = MagicMock()
         mock_instance.handle_command = AsyncMock()
@@ -19,8 +35,33 @@ def mock_terminal_fixture() -> Generator[MagicMock, None, None]:
         yield mock_instance
 
 
-@pytest.mark.asyncio
-async def test_dev_mode_commands(mock_terminal_fixture: MagicMock) -> None:
+@pytest.fixture
+def captured_prints(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    """Record print() output as plain strings for one test."""
+    out: list[str] = []
+
+    def fake_print(*args: object, **kwargs: object) -> None:
+        out.append(" ".join(map(str, args)))
+
+    monkeypatch.setattr("builtins.print", fake_print)
+    return out
+
+
+@pytest.fixture(autouse=True)
+def _reset_mocks(mock_terminal_fixture: MagicMock) -> None:
+    """Clear queued terminal side effects before each test."""
+    for mock in (
+        mock_terminal_fixture.parse_request,
+        mock_terminal_fixture.handle_command,
+    ):
+        mock.reset_mock(side_effect=True)
+
+
+async def test_dev_mode_commands(
+    mock_terminal_fixture: MagicMock,
+    feed_input: Callable[..., None],
+    captured_prints: list[str],
+) -> None:
     """Test developer mode command handling."""
     # Setup mock terminal responses
     mock_terminal_fixture.parse_request.side_effect = [
@@ -48,81 +89,60 @@ async def test_dev_mode_commands(mock_terminal_fixture: MagicMock) -> None:
         },
     ]
 
-    # Mock input/print functions
-    with patch("builtins.input", side_effect=["help", "exit"]), patch(
-        "builtins.print"
-    ) as mock_print:
-        await run_dev_mode()
+    feed_input("help", "exit")
+    await run_dev_mode()
 
-        # Verify output
-        mock_print.assert_any_call("Help message")
-        mock_print.assert_any_call("Goodbye!")
+    # Verify output
+    assert {"Help message", "Goodbye!"} <= set(captured_prints)
 
 
-@pytest.mark.asyncio
+@pytest.mark.parametrize("error,expected_msg", _ERROR_CASES)
 async def test_dev_mode_error_handling(
     mock_terminal_fixture: MagicMock,
+    feed_input: Callable[..., None],
+    captured_prints: list[str],
+    error: type[Exception],
+    expected_msg: str,
 ) -> None:
     """Test error handling in developer mode."""
-    error_cases: list[tuple[type[Exception], str]] = [
-        (ValueError, "Value error: Invalid command"),
-        (TypeError, "Type error: Type error"),
-        (Exception, "Unexpected error: Unexpected error"),
+    mock_terminal_fixture.parse_request.side_effect = [
+        error("Invalid command"),
+        _EXIT_REQUEST,
     ]
+    mock_terminal_fixture.handle_command.side_effect = [_GOODBYE_RESPONSE]
+
+    feed_input("invalid", "exit")
+    await run_dev_mode()
+    assert expected_msg in captured_prints
+
 
-    for error, expected_msg in error_cases:
-        # Reset mocks for each test case
-        mock_terminal_fixture.parse_request.reset_mock()
-        mock_terminal_fixture.handle_command.reset_mock()
-
-        # Set up the error case
-        mock_terminal_fixture.parse_request.side_effect = [
-            error("Invalid command"),
-            {"jsonrpc": "2.0", "method": "exit", "id": 1},
-        ]
-        mock_terminal_fixture.handle_command.side_effect = [
-            {"jsonrpc": "2.0", "result": "Goodbye!", "id": 1}
-        ]
-
-        with patch("builtins.input", side_effect=["invalid", "exit"]), patch(
-            "builtins.print"
-        ) as mock_print:
-            await run_dev_mode()
-            expected_error = expected_msg.split(":")[0]
-            mock_print.assert_any_call(f"{expected_error}: Invalid command")
-
-
-@pytest.mark.asyncio
-async def test_dev_mode_empty_input(mock_terminal_fixture: MagicMock) -> None:
+async def test_dev_mode_empty_input(
+    mock_terminal_fixture: MagicMock,
+    feed_input: Callable[..., None],
+    captured_prints: list[str],
+) -> None:
     """Test empty input handling in developer mode."""
-    mock_terminal_fixture.parse_request.side_effect = [
-        {"jsonrpc": "2.0", "method": "exit", "id": 1},
-    ]
-    mock_terminal_fixture.handle_command.side_effect = [
-        {"jsonrpc": "2.0", "result": "Goodbye!", "id": 1},
-    ]
+    mock_terminal_fixture.parse_request.side_effect = [_EXIT_REQUEST]
+    mock_terminal_fixture.handle_command.side_effect = [_GOODBYE_RESPONSE]
 
-    with patch("builtins.input", side_effect=["", "exit"]), patch(
-        "builtins.print"
-    ) as mock_print:
-        await run_dev_mode()
-        # Verify that no error was printed for empty input
-        assert mock_print.call_count == 5
+    feed_input("", "exit")
+    await run_dev_mode()
+    # Verify that no error was printed for empty input
+    assert len(captured_prints) == 5
 
 
-@pytest.mark.asyncio
-async def test_dev_mode_interrupts(mock_terminal_fixture: MagicMock) -> None:
+async def test_dev_mode_interrupts(
+    mock_terminal_fixture: MagicMock,
+    feed_input: Callable[..., None],
+    captured_prints: list[str],
+) -> None:
     """Test interrupt handling in developer mode."""
     # Test KeyboardInterrupt
-    with patch("builtins.input", side_effect=KeyboardInterrupt), patch(
-        "builtins.print"
-    ) as mock_print:
-        await run_dev_mode()
-        mock_print.assert_called_with("\nExiting developer mode")
+    feed_input(KeyboardInterrupt)
+    await run_dev_mode()
+    assert captured_prints[-1] == "\nExiting developer mode"
 
     # Test EOFError
-    with patch("builtins.input", side_effect=EOFError), patch(
-        "builtins.print"
-    ) as mock_print:
-        await run_dev_mode()
-        mock_print.assert_called_with("\nExiting developer mode")
+    feed_input(EOFError)
+    await run_dev_mode()
+    assert captured_prints[-1] == "\nExiting developer mode"
@@ -1,17 +1,46 @@
 """Tests for server error handling."""
 
 import logging
-from collections.abc import Generator
+from collections.abc import Callable, Generator
 from pathlib import Path
+from types import SimpleNamespace
 from typing import Any
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import MagicMock, patch
 
 import pytest
 
+import mcp_server_neurolorap.server as server_module
 from mcp_server_neurolorap.server import run_dev_mode
 
-# Disable logging for tests
-logging.getLogger("mcp_server_neurolorap.server").setLevel(logging.CRITICAL)
+_REPORTER_ERRORS = [
+    pytest.param(
+        ValueError("Invalid pattern"),
+        {"output_filename": "test.md", "ignore_patterns": ["["]},
+        id="invalid-pattern",
+    ),
+    pytest.param(OSError("Permission denied"), {}, id="file-system"),
+    pytest.param(ValueError("Analysis failed"), {}, id="analysis"),
+    pytest.param(ValueError("Report generation failed"), {}, id="report"),
+]
+
+_COLLECTOR_ERRORS = [
+    pytest.param(
+        ValueError("Invalid path"),
+        {"input_path": "/nonexistent/path", "title": "Test"},
+        id="invalid-path",
+    ),
+    pytest.param(OSError("Permission denied"), {}, id="file-system"),
+    pytest.param(ValueError("Collection failed"), {}, id="collection"),
+    pytest.param(Exception("Unexpected error"), {}, id="unexpected"),
+]
+
+
+@pytest.fixture(autouse=True, scope="module")
+def _disable_logging() -> Generator[None, None, None]:
+    """Disable logging globally while this module's tests run."""
+    logging.disable(logging.CRITICAL)
+    yield
+    logging.disable(logging.NOTSET)
 
 
 class MockTerminal:
@@ -54,11 +83,10 @@ class MockTerminal:
         return {"error": {"message": "Invalid request"}, "id": request["id"]}
 
 
-class ToolMock(AsyncMock):
-    """Custom AsyncMock that matches the expected tool callable type."""
+class FakeTool:
+    """Plain async stand-in for a registered tool."""
 
-    def __init__(self, *args: Any, **kwargs: Any) -> None:
-        super().__init__(*args, **kwargs)
+    def __init__(self) -> None:
         self._side_effect: Exception | None = None
 
     def set_side_effect(self, effect: Exception | None) -> None:
@@ -77,266 +105,126 @@ class ToolMock(AsyncMock):
             return "No files found to process or error occurred"
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_fastmcp() -> Generator[MagicMock, None, None]:
     """Mock FastMCP server."""
-    with patch("mcp_server_neurolorap.server.FastMCP") as mock:
+    with patch.object(server_module, "FastMCP") as mock:
         mock_server = MagicMock()
         mock_server.name = "neurolorap"
         mock_server.tools = {
-            "project_structure_reporter": ToolMock(),
-            "code_collector": ToolMock(),
+            "project_structure_reporter": FakeTool(),
+            "code_collector": FakeTool(),
         }
         mock_server.tool_called = False
         mock.return_value = mock_server
         yield mock_server
 
 
-@pytest.mark.asyncio
+@pytest.fixture(autouse=True)
+def _reset_tools(mock_fastmcp: MagicMock) -> None:
+    """Clear side effects left on the shared tool mocks."""
+    for tool in mock_fastmcp.tools.values():
+        tool.set_side_effect(None)
+
+
+@pytest.mark.parametrize("error,kwargs", _REPORTER_ERRORS)
 async def test_project_structure_reporter_error_handling(
-    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, mock_fastmcp: MagicMock
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    mock_fastmcp: MagicMock,
+    error: Exception,
+    kwargs: dict[str, Any],
 ) -> None:
     """Test error handling in project_structure_reporter tool."""
     monkeypatch.setenv("MCP_PROJECT_ROOT", str(tmp_path))
+    tool: FakeTool = mock_fastmcp.tools["project_structure_reporter"]
 
-    # Test with invalid ignore patterns
-    tool = mock_fastmcp.tools["project_structure_reporter"]
-    tool.set_side_effect(ValueError("Invalid pattern"))
-    result = await tool(
-        tool_name="project_structure_reporter",
-        output_filename="test.md",
-        ignore_patterns=["["],
-    )
-    assert "Error generating report" in result
-
-    # Test with file system error
-    tool = mock_fastmcp.tools["project_structure_reporter"]
-    tool.set_side_effect(OSError("Permission denied"))
-    result = await tool(tool_name="project_structure_reporter")
-    assert "Error generating report" in result
-
-    # Test with analysis error
-    tool = mock_fastmcp.tools["project_structure_reporter"]
-    tool.set_side_effect(ValueError("Analysis failed"))
-    result = await tool(tool_name="project_structure_reporter")
-    assert "Error generating report" in result
+    tool.set_side_effect(error)
+    result = await tool(tool_name="project_structure_reporter", **kwargs)
+    assert result == "Error generating report"
 
-    # Test with report generation error
-    tool = mock_fastmcp.tools["project_structure_reporter"]
-    tool.set_side_effect(ValueError("Report generation failed"))
-    result = await tool(tool_name="project_structure_reporter")
-    assert "Error generating report" in result
 
-
-@pytest.mark.asyncio
+@pytest.mark.parametrize("error,kwargs", _COLLECTOR_ERRORS)
 async def test_code_collector_error_handling(
-    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, mock_fastmcp: MagicMock
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    mock_fastmcp: MagicMock,
+    error: Exception,
+    kwargs: dict[str, Any],
 ) -> None:
     """Test error handling in code_collector tool."""
     monkeypatch.setenv("MCP_PROJECT_ROOT", str(tmp_path))
+    tool: FakeTool = mock_fastmcp.tools["code_collector"]
 
-    # Test with invalid input path
-    tool = mock_fastmcp.tools["code_collector"]
-    tool.set_side_effect(ValueError("Invalid path"))
-    result = await tool(
-        tool_name="code_collector",
-        input_path="/nonexistent/path",
-        title="Test",
-    )
-    assert "No files found to process or error occurred" in result
-
-    # Test with file system error
-    tool = mock_fastmcp.tools["code_collector"]
-    tool.set_side_effect(OSError("Permission denied"))
-    result = await tool(tool_name="code_collector")
-    assert "No files found to process or error occurred" in result
-
-    # Test with collection error
-    tool = mock_fastmcp.tools["code_collector"]
-    tool.set_side_effect(ValueError("Collection failed"))
-    result = await tool(tool_name="code_collector")
-    assert "No files found to process or error occurred" in result
+    tool.set_side_effect(error)
+    result = await tool(tool_name="code_collector", **kwargs)
+    assert result == "No files found to process or error occurred"
 
-    # Test with unexpected error
-    tool = mock_fastmcp.tools["code_collector"]
-    tool.set_side_effect(Exception("Unexpected error"))
-    result = await tool(tool_name="code_collector")
-    assert "No files found to process or error occurred" in result
 
-
-@pytest.mark.asyncio
-async def test_run_dev_mode_value_error(
-    monkeypatch: pytest.MonkeyPatch,
-) -> None:
-    """Test error handling in run_dev_mode."""
+@pytest.fixture
+def dev_io(
+    monkeypatch: pytest.MonkeyPatch, feed_input: Callable[..., None]
+) -> SimpleNamespace:
+    """Capture print() output and feed input() for run_dev_mode."""
     monkeypatch.setenv("MCP_PROJECT_ROOT", "/tmp")
-
-    # Mock print function to capture output
     prints: list[str] = []
-
-    def print_mock(x: object) -> None:
-        prints.append(str(x))
-
-    monkeypatch.setattr("builtins.print", print_mock)
-
-    # Mock input to raise ValueError
-    input_mock = MagicMock(side_effect=[ValueError("Invalid input"), "exit"])
-    monkeypatch.setattr("builtins.input", input_mock)
-
-    # Run dev mode
-    await run_dev_mode()
-
-    # Verify error handling
-    assert any("Value error: Invalid input" in msg for msg in prints)
-    assert any("Exiting developer mode" in msg for msg in prints)
-
-
-@pytest.mark.asyncio
-async def test_run_dev_mode_type_error(
-    monkeypatch: pytest.MonkeyPatch,
+    monkeypatch.setattr("builtins.print", lambda x: prints.append(str(x)))
+    return SimpleNamespace(prints=prints, set_inputs=feed_input)
+
+
+@pytest.mark.parametrize(
+    "error,expected_msg",
+    [
+        (ValueError("Invalid input"), "Value error: Invalid input"),
+        (TypeError("Invalid type"), "Type error: Invalid type"),
+    ],
+)
+async def test_run_dev_mode_input_error(
+    dev_io: SimpleNamespace, error: Exception, expected_msg: str
 ) -> None:
-    """Test type error handling in run_dev_mode."""
-    monkeypatch.setenv("MCP_PROJECT_ROOT", "/tmp")
-
-    # Mock print function to capture output
-    prints: list[str] = []
+    """Test value and type error handling in run_dev_mode."""
+    dev_io.set_inputs(error, "exit")
 
-    def print_mock(x: object) -> None:
-        prints.append(str(x))
-
-    monkeypatch.setattr("builtins.print", print_mock)
-
-    # Mock input to raise TypeError
-    input_mock = MagicMock(side_effect=[TypeError("Invalid type"), "exit"])
-    monkeypatch.setattr("builtins.input", input_mock)
-
-    # Run dev mode
     await run_dev_mode()
 
-    # Verify error handling
-    assert any("Type error: Invalid type" in msg for msg in prints)
-    assert any("Exiting developer mode" in msg for msg in prints)
+    assert expected_msg in dev_io.prints
+    assert any("Exiting developer mode" in msg for msg in dev_io.prints)
 
 
-@pytest.mark.asyncio
-async def test_run_dev_mode_empty_input(
-    monkeypatch: pytest.MonkeyPatch,
-) -> None:
-    """Test empty input handling in run_dev_mode."""
-    monkeypatch.setenv("MCP_PROJECT_ROOT", "/tmp")
-
-    # Mock print function to capture output
-    prints: list[str] = []
-
-    def print_mock(x: object) -> None:
-        prints.append(str(x))
-
-    monkeypatch.setattr("builtins.print", print_mock)
-
-    # Mock input to return empty string then exit
-    input_mock = MagicMock(side_effect=["", "exit"])
-    monkeypatch.setattr("builtins.input", input_mock)
-
-    # Run dev mode
-    await run_dev_mode()
-
-    # Verify error handling
-    assert not any("Invalid command format" in msg for msg in prints)
-    assert any("Exiting developer mode" in msg for msg in prints)
-
-
-@pytest.mark.asyncio
 async def test_run_dev_mode_invalid_command(
-    monkeypatch: pytest.MonkeyPatch,
+    dev_io: SimpleNamespace, monkeypatch: pytest.MonkeyPatch
 ) -> None:
     """Test invalid command format handling in run_dev_mode."""
-    monkeypatch.setenv("MCP_PROJECT_ROOT", "/tmp")
-
-    # Mock print function to capture output
-    prints: list[str] = []
-
-    def print_mock(x: object) -> None:
-        prints.append(str(x))
-
-    monkeypatch.setattr("builtins.print", print_mock)
-
     # Mock terminal to return None for parse_request
-    terminal = MockTerminal()
-    with patch(
-        "mcp_server_neurolorap.server.JsonRpcTerminal",
-        return_value=terminal,
-    ):
-        # Mock input with invalid command then exit
-        input_mock = MagicMock(side_effect=["invalid command", "exit"])
-        monkeypatch.setattr("builtins.input", input_mock)
+    monkeypatch.setattr(
+        server_module,
+        "JsonRpcTerminal",
+        MagicMock(return_value=MockTerminal()),
+    )
+    dev_io.set_inputs("invalid command", "exit")
 
-        # Run dev mode
-        await run_dev_mode()
+    await run_dev_mode()
 
-        # Verify error handling
-        assert any("Invalid command format" in msg for msg in prints)
-        assert any("Exiting developer mode" in msg for msg in prints)
+    assert any("Invalid command format" in msg for msg in dev_io.prints)
+    assert any("Exiting developer mode" in msg for msg in dev_io.prints)
 
 
-@pytest.mark.asyncio
 async def test_run_dev_mode_unknown_command(
-    monkeypatch: pytest.MonkeyPatch,
+    dev_io: SimpleNamespace, monkeypatch: pytest.MonkeyPatch
 ) -> None:
     """Test unknown command handling in run_dev_mode."""
-    monkeypatch.setenv("MCP_PROJECT_ROOT", "/tmp")
-
-    # Mock JsonRpcTerminal class
-    with patch(
-        "mcp_server_neurolorap.server.JsonRpcTerminal"
-    ) as mock_terminal_class:
-        terminal_instance = MockTerminal()
-        mock_terminal_class.return_value = terminal_instance
-
-        # Mock input to immediately exit
-        input_mock = MagicMock(side_effect=["unknown_command", "exit"])
-        monkeypatch.setattr("builtins.input", input_mock)
-
-        # Mock print function to capture output
-        prints: list[str] = []
-
-        def print_mock(x: object) -> None:
-            prints.append(str(x))
-
-        monkeypatch.setattr("builtins.print", print_mock)
-
-        # Run dev mode
-        await run_dev_mode()
-
-        # Verify error handling
-        error_msg = "Error: Method 'unknown_command' not found"
-        has_error = any(error_msg in msg for msg in prints)
-        has_exit = any("Exiting developer mode" in msg for msg in prints)
-
-        assert has_error, f"Expected '{error_msg}' in output"
-        assert has_exit, "Expected 'Exiting developer mode' message"
-
-
-@pytest.mark.asyncio
-async def test_run_dev_mode_keyboard_interrupt(
-    monkeypatch: pytest.MonkeyPatch,
-) -> None:
-    """Test keyboard interrupt handling in run_dev_mode."""
-    monkeypatch.setenv("MCP_PROJECT_ROOT", "/tmp")
-
-    # Mock input function to raise KeyboardInterrupt
-    input_mock = MagicMock(side_effect=KeyboardInterrupt)
-    monkeypatch.setattr("builtins.input", input_mock)
-
-    # Mock print function to capture output
-    prints: list[str] = []
-
-    def print_mock(x: object) -> None:
-        prints.append(str(x))
-
-    monkeypatch.setattr("builtins.print", print_mock)
+    monkeypatch.setattr(
+        server_module,
+        "JsonRpcTerminal",
+        MagicMock(return_value=MockTerminal()),
+    )
+    dev_io.set_inputs("unknown_command", "exit")
 
-    # Run dev mode
     await run_dev_mode()
 
-    # Verify error handling
-    assert any("Exiting developer mode" in msg for msg in prints)
+    error_msg = "Error: Method 'unknown_command' not found"
+    has_error = any(error_msg in msg for msg in dev_io.prints)
+    has_exit = any("Exiting developer mode" in msg for msg in dev_io.prints)
+
+    assert has_error, f"Expected '{error_msg}' in output"
+    assert has_exit, "Expected 'Exiting developer mode' message"
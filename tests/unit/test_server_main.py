@@ -1,48 +1,20 @@
 """Unit tests for main server functionality."""
 
-import os
 from collections.abc import Generator
 from pathlib import Path
 from typing import Any
-from unittest.mock import AsyncMock, MagicMock, NonCallableMock, patch
+from unittest.mock import AsyncMock, MagicMock, call, patch
 
 import pytest
 
+import mcp_server_neurolorap.server as server_module
 from mcp_server_neurolorap.server import create_server, get_project_root
 
 
-class ToolMock(AsyncMock):
-    """Custom AsyncMock that matches the expected tool callable type."""
-
-    def __init__(
-        self,
-        spec: list[str] | object | type[object] | None = None,
-        wraps: Any | None = None,
-        name: str | None = None,
-        spec_set: list[str] | object | type[object] | None = None,
-        parent: NonCallableMock | None = None,
-        _spec_state: Any | None = None,
-        _new_name: str = "",
-        _new_parent: NonCallableMock | None = None,
-        _spec_as_instance: bool = False,
-        _eat_self: bool | None = None,
-        unsafe: bool = False,
-        **kwargs: Any,
-    ) -> None:
-        super().__init__(
-            spec=spec,
-            wraps=wraps,
-            name=name,
-            spec_set=spec_set,
-            parent=parent,
-            _spec_state=_spec_state,
-            _new_name=_new_name,
-            _new_parent=_new_parent,
-            _spec_as_instance=_spec_as_instance,
-            _eat_self=_eat_self,
-            unsafe=unsafe,
-            **kwargs,
-        )
+class ToolMock:
+    """Plain stand-in for a registered tool callable."""
+
+    def __init__(self) -> None:
         self._collector: AsyncMock | None = None
 
     def set_collector(self, collector: AsyncMock | None) -> None:
@@ -88,66 +60,70 @@ class MockFastMCP:
 
 
 @pytest.fixture
-def mock_fastmcp() -> Generator[MockFastMCP, None, None]:
+def mock_fastmcp(monkeypatch: pytest.MonkeyPatch) -> MockFastMCP:
     """Mock FastMCP server."""
-    with patch("mcp_server_neurolorap.server.FastMCP") as mock:
-        mock_server = MockFastMCP("neurolorap")
-        mock.return_value = mock_server
-        yield mock_server
+    mock_server = MockFastMCP("neurolorap")
+    monkeypatch.setattr(server_module, "FastMCP", lambda name: mock_server)
+    return mock_server
 
 
 @pytest.fixture
 def mock_logger() -> Generator[MagicMock, None, None]:
     """Mock logger."""
-    with patch("mcp_server_neurolorap.server.logger") as mock_logger:
+    with patch.object(server_module, "logger") as mock_logger:
         yield mock_logger
 
 
 def test_create_server(mock_fastmcp: MockFastMCP) -> None:
-    """Test server creation and configuration."""
+    """Test server creation, initialization and tool registration."""
     server = create_server()
     assert server.name == "neurolorap"
     assert server.tool_called
     assert "code_collector" in server.tools
+    mock_fastmcp.debug.assert_any_call("Registering tool: code_collector")
+    mock_fastmcp.info.assert_called_with("Starting MCP server: neurolorap")
 
 
-def test_project_root_environment(mock_logger: MagicMock) -> None:
+@pytest.mark.parametrize(
+    "env_value,expected,logged",
+    [
+        pytest.param("/test/path", "/test/path", [], id="set"),
+        pytest.param(
+            None,
+            "/current/dir",
+            [call("Set MCP_PROJECT_ROOT to: %s", Path("/current/dir"))],
+            id="unset",
+        ),
+        # An empty value counts as unset and falls back to the cwd
+        pytest.param(
+            "",
+            "/current/dir",
+            [call("Set MCP_PROJECT_ROOT to: %s", Path("/current/dir"))],
+            id="empty",
+        ),
+    ],
+)
+def test_project_root_environment(
+    mock_logger: MagicMock,
+    monkeypatch: pytest.MonkeyPatch,
+    env_value: str | None,
+    expected: str,
+    logged: list[Any],
+) -> None:
     """Test project root environment variable handling."""
-    # Test with environment variable set
-    test_path = "/test/path"
-    with patch.dict(os.environ, {"MCP_PROJECT_ROOT": test_path}, clear=True):
-        root = get_project_root()
-        assert str(root) == test_path
-        mock_logger.info.assert_not_called()
-
-    # Test with environment variable not set
-    with patch.dict(os.environ, {}, clear=True):
-        with patch("pathlib.Path.cwd") as mock_cwd:
-            mock_cwd.return_value = Path("/current/dir")
-            root = get_project_root()
-            assert str(root) == "/current/dir"
-            mock_logger.info.assert_called_with(
-                "Set MCP_PROJECT_ROOT to: %s", Path("/current/dir")
-            )
+    # setenv first so teardown also undoes get_project_root's write
+    monkeypatch.setenv("MCP_PROJECT_ROOT", "")
+    if env_value is None:
+        monkeypatch.delenv("MCP_PROJECT_ROOT")
+    else:
+        monkeypatch.setenv("MCP_PROJECT_ROOT", env_value)
+    monkeypatch.setattr(Path, "cwd", lambda: Path("/current/dir"))
 
-
-@pytest.mark.asyncio
-async def test_server_initialization(mock_fastmcp: MockFastMCP) -> None:
-    """Test server initialization process."""
-    server = create_server()
-    assert server.name == "neurolorap"
-    mock_fastmcp.info.assert_called_with("Starting MCP server: neurolorap")
-
-
-@pytest.mark.asyncio
-async def test_server_tool_registration(mock_fastmcp: MockFastMCP) -> None:
-    """Test tool registration process."""
-    server = create_server()
-    assert "code_collector" in server.tools
-    mock_fastmcp.debug.assert_any_call("Registering tool: code_collector")
+    root = get_project_root()
+    assert str(root) == expected
+    assert mock_logger.info.call_args_list == logged
 
 
-@pytest.mark.asyncio
 async def test_server_error_handling(mock_fastmcp: MockFastMCP) -> None:
     """Test server error handling."""
     # Test initialization error
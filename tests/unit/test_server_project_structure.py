@@ -4,43 +4,18 @@ import os
 from collections.abc import Generator
 from pathlib import Path
 from typing import Any
-from unittest.mock import AsyncMock, MagicMock, NonCallableMock, patch
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
+import mcp_server_neurolorap.server as server_module
 
-class ToolMock(AsyncMock):
-    """Custom AsyncMock that matches the expected tool callable type."""
 
-    def __init__(
-        self,
-        spec: list[str] | object | type[object] | None = None,
-        wraps: Any | None = None,
-        name: str | None = None,
-        spec_set: list[str] | object | type[object] | None = None,
-        parent: NonCallableMock | None = None,
-        _spec_state: Any | None = None,
-        _new_name: str = "",
-        _new_parent: NonCallableMock | None = None,
-        _spec_as_instance: bool = False,
-        _eat_self: bool | None = None,
-        unsafe: bool = False,
-        **kwargs: Any,
-    ) -> None:
-        super().__init__(
-            spec=spec,
-            wraps=wraps,
-            name=name,
-            spec_set=spec_set,
-            parent=parent,
-            _spec_state=_spec_state,
-            _new_name=_new_name,
-            _new_parent=_new_parent,
-            _spec_as_instance=_spec_as_instance,
-            _eat_self=_eat_self,
-            unsafe=unsafe,
-            **kwargs,
-        )
+class ToolMock:
+    """Plain stand-in for the project structure reporter tool."""
+
+    def __init__(self) -> None:
+        self.side_effect: Exception | None = None
         self._reporter: AsyncMock | None = None
 
     def set_reporter(self, reporter: AsyncMock | None) -> None:
@@ -76,15 +51,14 @@ class ToolMock(AsyncMock):
 
 
 @pytest.fixture
-def mock_fastmcp() -> Generator[MagicMock, None, None]:
+def mock_fastmcp(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
     """Mock FastMCP server."""
-    with patch("mcp_server_neurolorap.server.FastMCP") as mock:
-        mock_server = MagicMock()
-        mock_server.name = "neurolorap"
-        mock_server.tools = {"project_structure_reporter": ToolMock()}
-        mock_server.tool_called = False
-        mock.return_value = mock_server
-        yield mock_server
+    mock_server = MagicMock()
+    mock_server.name = "neurolorap"
+    mock_server.tools = {"project_structure_reporter": ToolMock()}
+    mock_server.tool_called = False
+    monkeypatch.setattr(server_module, "FastMCP", lambda name: mock_server)
+    return mock_server
 
 
 @pytest.fixture
@@ -100,7 +74,6 @@ def temp_project(tmp_path: Path) -> Generator[Path, None, None]:
     yield tmp_path
 
 
-@pytest.mark.asyncio
 async def test_project_structure_reporter_tool(
     temp_project: Path,
     monkeypatch: pytest.MonkeyPatch,
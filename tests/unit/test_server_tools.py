@@ -1,47 +1,25 @@
 """Tests for server tools functionality."""
 
+import threading
 from collections.abc import Generator
 from pathlib import Path
 from typing import Any
-from unittest.mock import AsyncMock, MagicMock, NonCallableMock, patch
+from unittest.mock import MagicMock, patch
 
 import pytest
 
+import mcp_server_neurolorap.server as server_module
+from mcp_server_neurolorap.project_structure_reporter import (
+    ProjectStructureReporter,
+    ReportData,
+)
 from mcp_server_neurolorap.server import create_server
 
 
-class CodeCollectorToolMock(AsyncMock):
-    """Custom AsyncMock for code collector tool."""
-
-    def __init__(
-        self,
-        spec: list[str] | object | type[object] | None = None,
-        wraps: Any | None = None,
-        name: str | None = None,
-        spec_set: list[str] | object | type[object] | None = None,
-        parent: NonCallableMock | None = None,
-        _spec_state: Any | None = None,
-        _new_name: str = "",
-        _new_parent: NonCallableMock | None = None,
-        _spec_as_instance: bool = False,
-        _eat_self: bool | None = None,
-        unsafe: bool = False,
-        **kwargs: Any,
-    ) -> None:
-        super().__init__(
-            spec=spec,
-            wraps=wraps,
-            name=name,
-            spec_set=spec_set,
-            parent=parent,
-            _spec_state=_spec_state,
-            _new_name=_new_name,
-            _new_parent=_new_parent,
-            _spec_as_instance=_spec_as_instance,
-            _eat_self=_eat_self,
-            unsafe=unsafe,
-            **kwargs,
-        )
+class CodeCollectorToolMock:
+    """Plain stand-in for the code collector tool."""
+
+    def __init__(self) -> None:
         self._side_effect: Exception | None = None
 
     def set_side_effect(self, effect: Exception | None) -> None:
@@ -58,38 +36,10 @@ class CodeCollectorToolMock(AsyncMock):
             return "No files found to process or error occurred"
 
 
-class ProjectStructureReporterToolMock(AsyncMock):
-    """Custom AsyncMock for project structure reporter tool."""
-
-    def __init__(
-        self,
-        spec: list[str] | object | type[object] | None = None,
-        wraps: Any | None = None,
-        name: str | None = None,
-        spec_set: list[str] | object | type[object] | None = None,
-        parent: NonCallableMock | None = None,
-        _spec_state: Any | None = None,
-        _new_name: str = "",
-        _new_parent: NonCallableMock | None = None,
-        _spec_as_instance: bool = False,
-        _eat_self: bool | None = None,
-        unsafe: bool = False,
-        **kwargs: Any,
-    ) -> None:
-        super().__init__(
-            spec=spec,
-            wraps=wraps,
-            name=name,
-            spec_set=spec_set,
-            parent=parent,
-            _spec_state=_spec_state,
-            _new_name=_new_name,
-            _new_parent=_new_parent,
-            _spec_as_instance=_spec_as_instance,
-            _eat_self=_eat_self,
-            unsafe=unsafe,
-            **kwargs,
-        )
+class ProjectStructureReporterToolMock:
+    """Plain stand-in for the project structure reporter tool."""
+
+    def __init__(self) -> None:
         self._side_effect: Exception | None = None
 
     def set_side_effect(self, effect: Exception | None) -> None:
@@ -106,10 +56,10 @@ class ProjectStructureReporterToolMock(AsyncMock):
             return "Error generating report"
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_fastmcp() -> Generator[MagicMock, None, None]:
     """Mock FastMCP server."""
-    with patch("mcp_server_neurolorap.server.FastMCP") as mock:
+    with patch.object(server_module, "FastMCP") as mock:
         mock_server = MagicMock()
         mock_server.name = "neurolorap"
         mock_server.tools = {
@@ -121,7 +71,22 @@ def mock_fastmcp() -> Generator[MagicMock, None, None]:
         yield mock_server
 
 
-@pytest.mark.asyncio
+@pytest.fixture(scope="module")
+def created_server(mock_fastmcp: MagicMock) -> dict[str, Any]:
+    """Create the server once and return its registered tool functions."""
+    create_server()
+    names = [c.kwargs["name"] for c in mock_fastmcp.tool.call_args_list]
+    funcs = [c.args[0] for c in mock_fastmcp.tool.return_value.call_args_list]
+    return dict(zip(names, funcs))
+
+
+@pytest.fixture(autouse=True)
+def _reset_tools(mock_fastmcp: MagicMock) -> None:
+    """Clear side effects left on the tool mocks by the previous test."""
+    for tool in mock_fastmcp.tools.values():
+        tool.set_side_effect(None)
+
+
 async def test_project_structure_reporter_success(
     tmp_path: Path, mock_fastmcp: MagicMock
 ) -> None:
@@ -136,7 +101,6 @@ async def test_project_structure_reporter_success(
     assert "Project structure report generated" in result
 
 
-@pytest.mark.asyncio
 async def test_code_collector_success(
     tmp_path: Path, mock_fastmcp: MagicMock
 ) -> None:
@@ -153,25 +117,58 @@ async def test_code_collector_success(
     assert "output.md" in result
 
 
-@pytest.mark.asyncio
 async def test_project_structure_reporter_error_handling(
     tmp_path: Path, mock_fastmcp: MagicMock
 ) -> None:
     """Test error handling in project structure reporter."""
-    create_server()
     tool = mock_fastmcp.tools["project_structure_reporter"]
     tool.set_side_effect(ValueError("Invalid configuration"))
     result = await tool()
-    assert "Error generating report" in result
+    assert result == "Error generating report"
 
 
-@pytest.mark.asyncio
 async def test_code_collector_error_handling(
     tmp_path: Path, mock_fastmcp: MagicMock
 ) -> None:
     """Test error handling in code collector."""
-    create_server()
     tool = mock_fastmcp.tools["code_collector"]
     tool.set_side_effect(ValueError("Invalid configuration"))
     result = await tool()
-    assert "No files found to process or error occurred" in result
+    assert result == "No files found to process or error occurred"
+
+
+async def test_project_structure_reporter_runs_in_thread(
+    tmp_path: Path,
+    created_server: dict[str, Any],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test the registered tool analyzes and writes off the event loop."""
+    monkeypatch.setenv("MCP_PROJECT_ROOT", str(tmp_path))
+    (tmp_path / "main.py").write_text("x = 1\n")
+    tool = created_server["project_structure_reporter"]
+
+    analyze = ProjectStructureReporter.analyze_project_structure
+    generate = ProjectStructureReporter.generate_markdown_report
+    threads: dict[str, int] = {}
+
+    def analyze_spy(self: ProjectStructureReporter) -> ReportData:
+        threads["analyze"] = threading.get_ident()
+        return analyze(self)
+
+    def generate_spy(
+        self: ProjectStructureReporter, data: ReportData, path: Path
+    ) -> None:
+        threads["generate"] = threading.get_ident()
+        generate(self, data, path)
+
+    with patch.object(
+        ProjectStructureReporter, "analyze_project_structure", analyze_spy
+    ), patch.object(
+        ProjectStructureReporter, "generate_markdown_report", generate_spy
+    ):
+        result = await tool()
+
+    assert "Project structure report generated" in result
+    assert (tmp_path / ".neurolora" / "PROJECT_STRUCTURE_REPORT.md").exists()
+    assert threading.get_ident() not in threads.values()
+    assert threads.keys() == {"analyze", "generate"}
@@ -1,7 +1,7 @@
 """Unit tests for the JsonRpcTerminal class."""
 
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Generator
 from unittest.mock import MagicMock
 
 import pytest
@@ -14,12 +14,22 @@ JsonRpcResponse = Dict[str, Any]
 JsonRpcError = Dict[str, Any]
 
 
-@pytest.fixture
-def terminal() -> JsonRpcTerminal:
-    """Create a JsonRpcTerminal instance for testing."""
+@pytest.fixture(scope="module")
+def shared_terminal() -> JsonRpcTerminal:
+    """Create one rootless JsonRpcTerminal for the whole module."""
     return JsonRpcTerminal()
 
 
+@pytest.fixture
+def terminal(
+    shared_terminal: JsonRpcTerminal,
+) -> Generator[JsonRpcTerminal, None, None]:
+    """Provide the shared terminal, restoring its command table after."""
+    commands = dict(shared_terminal.commands)
+    yield shared_terminal
+    shared_terminal.commands = commands
+
+
 @pytest.fixture
 def terminal_with_root(project_root: Path) -> JsonRpcTerminal:
     """Create a JsonRpcTerminal instance with project root."""
@@ -43,16 +53,18 @@ def test_init_with_project_root(
     terminal_with_root: JsonRpcTerminal, project_root: Path
 ) -> None:
     """Test initialization with project root."""
+    expected_root = project_root.resolve()
+
     # Check that project_root is set
     assert terminal_with_root.project_root is not None
     assert isinstance(terminal_with_root.project_root, Path)
-    assert terminal_with_root.project_root.resolve() == project_root.resolve()
+    assert terminal_with_root.project_root.resolve() == expected_root
 
     # Check that collector is initialized with correct project_root
     assert terminal_with_root.collector is not None
     collector_root = terminal_with_root.collector.project_root
     assert isinstance(collector_root, Path)
-    assert collector_root.resolve() == project_root.resolve()
+    assert collector_root.resolve() == expected_root
 
 
 @pytest.mark.parametrize(
@@ -119,7 +131,6 @@ def test_format_response_error(terminal: JsonRpcTerminal) -> None:
     assert "result" not in response
 
 
-@pytest.mark.asyncio
 async def test_handle_command_unknown(terminal: JsonRpcTerminal) -> None:
     """Test handling unknown commands."""
     request: JsonRpcRequest = {"jsonrpc": "2.0", "method": "unknown", "id": 1}
@@ -128,7 +139,6 @@ async def test_handle_command_unknown(terminal: JsonRpcTerminal) -> None:
     assert response["error"]["code"] == -32601
 
 
-@pytest.mark.asyncio
 async def test_handle_command_error(terminal: JsonRpcTerminal) -> None:
     """Test handling command execution errors."""
     # Mock collect command to raise an error
@@ -142,7 +152,6 @@ async def test_handle_command_error(terminal: JsonRpcTerminal) -> None:
     assert "Test error" in response["error"]["message"]
 
 
-@pytest.mark.asyncio
 async def test_cmd_help(terminal: JsonRpcTerminal) -> None:
     """Test help command."""
     result = await terminal.cmd_help([])
@@ -154,7 +163,6 @@ async def test_cmd_help(terminal: JsonRpcTerminal) -> None:
     assert "exit" in result
 
 
-@pytest.mark.asyncio
 async def test_cmd_list_tools(terminal: JsonRpcTerminal) -> None:
     """Test list_tools command."""
     result = await terminal.cmd_list_tools([])
@@ -162,7 +170,6 @@ async def test_cmd_list_tools(terminal: JsonRpcTerminal) -> None:
     assert "code_collector" in result
 
 
-@pytest.mark.asyncio
 async def test_cmd_collect_no_params(terminal: JsonRpcTerminal) -> None:
     """Test collect command without parameters."""
     with pytest.raises(ValueError, match="Path parameter required"):
@@ -213,7 +220,6 @@ def test_format_response_different_errors(
     assert "result" not in response
 
 
-@pytest.mark.asyncio
 async def test_handle_command_invalid_params(
     terminal: JsonRpcTerminal,
 ) -> None:
@@ -229,7 +235,6 @@ async def test_handle_command_invalid_params(
     assert response["error"]["code"] == -32602
 
 
-@pytest.mark.asyncio
 async def test_cmd_collect_success(
     terminal_with_root: JsonRpcTerminal, project_root: Path
 ) -> None:
@@ -238,14 +243,10 @@ async def test_cmd_collect_success(
     test_file = project_root / "test.py"
     test_file.write_text("print('test')")
 
-    try:
-        result = await terminal_with_root.cmd_collect([str(test_file)])
-        assert isinstance(result, dict)
-        assert "Code collection complete!" in result["result"]
-        assert "Output file:" in result["result"]
-    finally:
-        # Cleanup
-        test_file.unlink()
+    result = await terminal_with_root.cmd_collect([str(test_file)])
+    assert isinstance(result, dict)
+    assert "Code collection complete!" in result["result"]
+    assert "Output file:" in result["result"]
 
 
 @pytest.mark.parametrize(
@@ -259,7 +260,6 @@ async def test_cmd_collect_success(
         "multiple/path/segments",  # Multiple segments
     ],
 )
-@pytest.mark.asyncio
 async def test_cmd_collect_path_formats(
     terminal_with_root: JsonRpcTerminal, project_root: Path, path_input: str
 ) -> None:
@@ -270,22 +270,16 @@ async def test_cmd_collect_path_formats(
     test_file = test_dir / "test.py"
     test_file.write_text("print('test')")
 
-    try:
-        # Replace path segments in input with actual test directory
-        actual_path = str(test_dir)
-        if path_input.startswith(("'", '"')):
-            actual_path = f"{path_input[0]}{test_dir}{path_input[0]}"
+    # Replace path segments in input with actual test directory
+    actual_path = str(test_dir)
+    if path_input.startswith(("'", '"')):
+        actual_path = f"{path_input[0]}{test_dir}{path_input[0]}"
 
-        result = await terminal_with_root.cmd_collect([actual_path])
-        assert isinstance(result, dict)
-        assert "Code collection complete!" in result["result"]
-    finally:
-        # Cleanup
-        test_file.unlink()
-        test_dir.rmdir()
+    result = await terminal_with_root.cmd_collect([actual_path])
+    assert isinstance(result, dict)
+    assert "Code collection complete!" in result["result"]
 
 
-@pytest.mark.asyncio
 async def test_cmd_collect_with_subproject(
     terminal_with_root: JsonRpcTerminal, project_root: Path
 ) -> None:
@@ -294,19 +288,12 @@ async def test_cmd_collect_with_subproject(
     test_file = project_root / "test.py"
     test_file.write_text("print('test')")
 
-    try:
-        result = await terminal_with_root.cmd_collect(
-            [str(test_file), "test-sub"]
-        )
-        assert isinstance(result, dict)
-        assert "Code collection complete!" in result["result"]
-        assert "Subproject ID: test-sub" in result["result"]
-    finally:
-        # Cleanup
-        test_file.unlink()
+    result = await terminal_with_root.cmd_collect([str(test_file), "test-sub"])
+    assert isinstance(result, dict)
+    assert "Code collection complete!" in result["result"]
+    assert "Subproject ID: test-sub" in result["result"]
 
 
-@pytest.mark.asyncio
 async def test_cmd_collect_invalid_collector_creation(
     terminal: JsonRpcTerminal,
 ) -> None:
@@ -318,7 +305,6 @@ async def test_cmd_collect_invalid_collector_creation(
         await invalid_terminal.cmd_collect(["some/path"])
 
 
-@pytest.mark.asyncio
 async def test_cmd_collect_no_files(
     terminal_with_root: JsonRpcTerminal,
 ) -> None:
@@ -329,14 +315,12 @@ async def test_cmd_collect_no_files(
         await terminal_with_root.cmd_collect(["nonexistent"])
 
 
-@pytest.mark.asyncio
 async def test_cmd_exit(terminal: JsonRpcTerminal) -> None:
     """Test exit command."""
     result = await terminal.cmd_exit([])
     assert result == "Goodbye!"
 
 
-@pytest.mark.asyncio
 async def test_command_execution_flow(terminal: JsonRpcTerminal) -> None:
     """Test complete command execution flow."""
     # Test help command
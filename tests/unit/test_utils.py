@@ -5,6 +5,8 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+import mcp_server_neurolorap.server as server_module
+
 T = TypeVar("T", bound=Callable[..., Any])
 ToolCallable = Callable[..., Coroutine[Any, Any, str]]
 
@@ -25,7 +27,8 @@ class ToolMock(AsyncMock):
         *args: Any,
         **kwargs: Any,
     ) -> str:
-        from mcp_server_neurolorap.server import logger
+        # Read through the module so a patched logger is picked up
+        logger = server_module.logger
 
         try:
             input_val = args[0] if args else kwargs.get("input_path")
@@ -40,9 +43,6 @@ class ToolMock(AsyncMock):
                 subproject_id,
             )
             logger.info("Starting code collection")
-            logger.debug("Input: %s", input_val)
-            logger.debug("Title: %s", title)
-            logger.debug("Subproject ID: %s", subproject_id)
 
             if self.side_effect is not None:
                 raise self.side_effect
@@ -68,26 +68,29 @@ class MockFastMCP:
     def __init__(self, name: str) -> None:
         self.name = name
         self.tools: Dict[str, ToolMock] = {}
-        self.tool_called = False
         self._run_mock = MagicMock()
         self.info = MagicMock()
         self.debug = MagicMock()
         self.error = MagicMock()
-        self._tool_mock = MagicMock()
+        self._tool_error: Exception | None = None
+
+    @property
+    def tool_called(self) -> bool:
+        """Whether any tool has been registered."""
+        return bool(self.tools)
 
     def set_tool_error(self, error: Exception) -> None:
         """Set error to be raised during tool registration."""
-        self._tool_mock.side_effect = error
+        self._tool_error = error
 
     def tool(self, *args: Any, **kwargs: Any) -> Callable[[T], T]:
         """Tool decorator."""
-        if hasattr(self._tool_mock, "side_effect"):
-            raise self._tool_mock.side_effect
+        if self._tool_error is not None:
+            raise self._tool_error
 
         def decorator(func: T) -> T:
             tool_mock = ToolMock()
             self.tools[func.__name__] = tool_mock
-            self.tool_called = True
             return cast(T, tool_mock)
 
         return decorator
@@ -100,7 +103,7 @@ class MockFastMCP:
 @pytest.fixture
 def mock_fastmcp() -> Generator[MockFastMCP, None, None]:
     """Mock FastMCP server."""
-    with patch("mcp_server_neurolorap.server.FastMCP") as mock:
+    with patch.object(server_module, "FastMCP") as mock:
         mock_server = MockFastMCP("neurolorap")
         mock.return_value = mock_server
         yield mock_server
@@ -109,7 +112,7 @@ def mock_fastmcp() -> Generator[MockFastMCP, None, None]:
 @pytest.fixture
 def mock_terminal() -> Generator[MagicMock, None, None]:
     """Mock JsonRpcTerminal."""
-    with patch("mcp_server_neurolorap.server.terminal") as mock:
+    with patch.object(server_module, "terminal") as mock:
         mock.parse_request = MagicMock()
         mock.handle_command = AsyncMock()
         yield mock
@@ -118,5 +121,5 @@ def mock_terminal() -> Generator[MagicMock, None, None]:
 @pytest.fixture
 def mock_logger() -> Generator[MagicMock, None, None]:
     """Mock logger."""
-    with patch("mcp_server_neurolorap.server.logger") as mock_logger:
+    with patch.object(server_module, "logger") as mock_logger:
         yield mock_logger